@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import argparse
-import asyncio
 import json
 import os
 import sys
@@ -18,6 +17,7 @@ if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
 from src.config import load_config
+from src.event_loop import run_async
 from src.session_manager import SessionManager
 
 
@@ -137,7 +137,7 @@ async def _run_once(instruction: str) -> int:
 
 def main() -> int:
     args = _build_argument_parser().parse_args()
-    return asyncio.run(_run_once(args.instruction))
+    return run_async(_run_once(args.instruction))
 
 
 if __name__ == "__main__":
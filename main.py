@@ -4,9 +4,10 @@
 from __future__ import annotations
 
 import argparse
-import asyncio
 import sys
 
+from src.event_loop import run_async
+
 
 def _should_launch_tui(*, stdin_is_tty: bool, stdout_is_tty: bool) -> bool:
     """Return whether the environment can support Textual's full-screen TUI.
@@ -52,13 +53,12 @@ Examples:
         from src.cli import main as cli_main
 
         try:
-            asyncio.run(cli_main(initial_prompt=args.prompt, once=args.once))
+            run_async(cli_main(initial_prompt=args.prompt, once=args.once))
         except KeyboardInterrupt:
             print("\nGoodbye!")
         return
 
-    from src.config import load_config
-    from src.tui import GemCodeApp
+    from src.tui import run_tui
 
     if not _should_launch_tui(
         stdin_is_tty=sys.stdin.isatty(),
@@ -70,7 +70,7 @@ Examples:
         if args.prompt:
             from src.cli import main as cli_main
 
-            asyncio.run(cli_main(initial_prompt=args.prompt, once=True))
+            run_async(cli_main(initial_prompt=args.prompt, once=True))
             return
 
         print(
@@ -79,16 +79,7 @@ Examples:
         )
         return
 
-    config = load_config()
-    app = GemCodeApp(config)
-    try:
-        app.run()
-    except Exception as exc:
-        # Textual startup failures can otherwise collapse the alternate screen
-        # before the user sees what happened. Re-raising as plain stderr output
-        # makes startup issues diagnosable from a normal shell.
-        print(f"Gem Code TUI failed to start: {exc}", file=sys.stderr)
-        raise
+    run_tui()
 
 
 if __name__ == "__main__":
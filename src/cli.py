@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import os
+import sys
 from typing import Any, Dict, Optional
 
 from rich import print
@@ -9,29 +10,94 @@ from rich.console import Console
 from rich.text import Text
 
 from .config import Config, load_config
-from .decorate import pc_blue, pc_cyan, pc_gray
+from .event_loop import run_async
+from .decorate import pc_cyan, pc_gray
 from .permissions import PermissionDecision, normalize_bash_command
 from .session_manager import SessionManager
-import readline
 
 console = Console()
 _stream_phase: str | None = None
 
+# Streamed deltas are tiny (often 1-5 characters) and arrive hundreds of times
+# per second, so they bypass `console.print` — its markup/render pipeline and
+# per-call flush dominate the streaming loop. Styling is a raw ANSI prefix
+# emitted once per phase, and writes are flushed on newline, after a short
+# debounce, or when the phase ends.
+_STREAM_ANSI_PREFIX = {"reasoning": "\x1b[2m", "content": "\x1b[34m"}
+_ANSI_BLUE = "\x1b[34m"
+_ANSI_RESET = "\x1b[0m"
+_STREAM_FLUSH_INTERVAL = 0.016
+_stream_buffer: list[str] = []
+_stream_flush_handle: asyncio.TimerHandle | None = None
+_stream_reset = ""
+
+
+def _flush_stream() -> None:
+    global _stream_flush_handle
+    if _stream_flush_handle is not None:
+        _stream_flush_handle.cancel()
+        _stream_flush_handle = None
+    if not _stream_buffer:
+        return
+    out = console.file
+    out.write("".join(_stream_buffer))
+    _stream_buffer.clear()
+    out.flush()
+
+
+def _write_stream(phase: str, chunk: str) -> None:
+    global _stream_flush_handle
+    _switch_stream_phase(phase)
+    _stream_buffer.append(chunk)
+    if "\n" in chunk:
+        _flush_stream()
+        return
+    if _stream_flush_handle is not None:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        _flush_stream()
+        return
+    _stream_flush_handle = loop.call_later(_STREAM_FLUSH_INTERVAL, _flush_stream)
+
+
+def _close_stream_phase() -> None:
+    global _stream_reset
+    _stream_buffer.append(_stream_reset + "\n")
+    _stream_reset = ""
+    _flush_stream()
+
 
 def _switch_stream_phase(next_phase: str) -> None:
-    global _stream_phase
-    if _stream_phase and _stream_phase != next_phase:
-        console.print()
+    global _stream_phase, _stream_reset
+    if _stream_phase == next_phase:
+        return
+    if _stream_phase:
+        _close_stream_phase()
     _stream_phase = next_phase
+    if console.is_terminal and not console.no_color:
+        _stream_buffer.append(_STREAM_ANSI_PREFIX[next_phase])
+        _stream_reset = _ANSI_RESET
 
 
 def _end_stream_line() -> None:
     global _stream_phase
     if _stream_phase is not None:
-        console.print()
+        _close_stream_phase()
         _stream_phase = None
 
 
+def _write_raw(text: str, ansi_prefix: str = "") -> None:
+    """Write a whole block to the console file, bypassing rich rendering."""
+
+    if ansi_prefix and console.is_terminal and not console.no_color:
+        text = f"{ansi_prefix}{text}{_ANSI_RESET}"
+    out = console.file
+    out.write(text + "\n")
+    out.flush()
+
+
 async def async_input(prompt: str = "") -> str:
     """Collect terminal input without blocking the event loop."""
 
@@ -39,23 +105,24 @@ async def async_input(prompt: str = "") -> str:
 
 
 def on_reasoning(chunk: str) -> None:
-    _switch_stream_phase("reasoning")
-    console.print(Text(chunk, style="dim"), end="")
+    _write_stream("reasoning", chunk)
 
 
 def on_content(chunk: str) -> None:
-    _switch_stream_phase("content")
-    console.print(Text(chunk, style="blue"), end="")
+    _write_stream("content", chunk)
 
 
 def on_tool_start(tool_name: str, args: dict) -> None:
     _end_stream_line()
-    console.print(pc_blue(f"🛠️  Executing tool: {tool_name}"))
+    # Built as `Text` so tool names (MCP names included) are never read as markup.
+    console.print(Text(f"🛠️  Executing tool: {tool_name}", style="blue"))
 
 
 def on_tool_result(tool_name: str, result: str) -> None:
     _end_stream_line()
-    console.print(pc_blue(f"👁 OBSERVE\n{result}\n"))
+    # Tool results can be tens of KB and contain arbitrary `[...]` text, so
+    # they skip rich's markup parser, highlighter and wrapping entirely.
+    _write_raw(f"👁 OBSERVE\n{result}\n", _ANSI_BLUE)
 
 
 def make_cli_approval_callback(config: Config):
@@ -152,6 +219,11 @@ async def main(initial_prompt: str | None = None, once: bool = False) -> None:
 
     request_tool_approval = make_cli_approval_callback(config)
 
+    # `readline` only adds line editing/history to interactive `input()`; a
+    # piped or `--once` run never prompts, so it skips the import.
+    if not once and sys.stdin.isatty():
+        import readline  # noqa: F401
+
     console.print(
         pc_cyan(
             """
@@ -213,6 +285,6 @@ async def main(initial_prompt: str | None = None, once: bool = False) -> None:
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        run_async(main())
     except Exception as exc:
         print(f"[red]Unexpected error: {exc}[/]")
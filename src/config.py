@@ -1,11 +1,20 @@
+import asyncio
+import functools
 import os
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Literal, Optional
+from typing import Dict, Literal, Optional, Tuple
+import httpx
 from dotenv import load_dotenv
-from openai import AsyncOpenAI
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+try:
+    import h2  # noqa: F401  # optional: enables HTTP/2 in httpx
+except ImportError:  # pragma: no cover - exercised only when h2 is absent
+    h2 = None
 
 from .permissions import PermissionMode, policy_mode_from_env
+from .rate_limit import RateLimiter
 from .security import SecuritySettings, load_security_settings
 
 
@@ -28,6 +37,9 @@ class Config:
     predict_before_call_enabled: bool = False
     self_discovery_enabled: bool = False
     permission_mode: PermissionMode = "strict"
+    # Client-side throttle for model requests; `None` leaves that axis unlimited.
+    requests_per_minute: Optional[int] = None
+    tokens_per_minute: Optional[int] = None
 
 
 def _expand_path(path: Optional[str]) -> Optional[str]:
@@ -105,6 +117,8 @@ def load_config() -> Config:
         predict_before_call_enabled=_parse_bool_env("GEM_CODE_PREDICT_BEFORE_CALL", False),
         self_discovery_enabled=_parse_bool_env("GEM_CODE_SELF_DISCOVERY", False),
         permission_mode=policy_mode_from_env(default="strict"),
+        requests_per_minute=_parse_positive_int_env("OPENAI_RPM"),
+        tokens_per_minute=_parse_positive_int_env("OPENAI_TPM"),
     )
 
 
@@ -120,6 +134,19 @@ def _parse_bool_env(name: str, default: bool) -> bool:
     return default
 
 
+def _parse_positive_int_env(name: str) -> Optional[int]:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return None
+    try:
+        value = int(raw.strip())
+    except ValueError as exc:
+        raise ValueError(f"{name} must be a positive integer") from exc
+    if value <= 0:
+        raise ValueError(f"{name} must be a positive integer")
+    return value
+
+
 SYSTEM_PROMPT = """
 你是 Gem Code，一个轻量级的 CLI Agent。
 
@@ -179,7 +206,17 @@ PREDICT_BEFORE_CALL_CLAUSE = """
 仅本会话启用 GEM_CODE_PREDICT_BEFORE_CALL=true 时该规则生效；其他情况下忽略本节。
 """
 
+# `SYSTEM_PROMPT` also contains literal JSON braces, so it cannot go through
+# `str.format`. Split it around its two placeholders once at import time and
+# render by concatenation instead of rescanning the whole template per call.
+_SYSTEM_PROMPT_HEAD, _, _SYSTEM_PROMPT_REST = SYSTEM_PROMPT.partition("{workdir}")
+_SYSTEM_PROMPT_MIDDLE, _, _SYSTEM_PROMPT_TAIL = _SYSTEM_PROMPT_REST.partition("{security_summary}")
 
+
+# Arguments are plain strings, a frozen `SecuritySettings` and a flag, so the
+# rendered prompt can be memoized: session creation, `clear_history`, resume
+# and compaction all re-request it and get back the very same string object.
+@functools.lru_cache(maxsize=8)
 def get_system_prompt(
     workdir: str,
     security: Optional[SecuritySettings] = None,
@@ -196,14 +233,16 @@ def get_system_prompt(
     never mutates `Session.history`.
     """
 
-    rendered = SYSTEM_PROMPT.replace("{workdir}", str(Path(workdir).expanduser()))
-    rendered = rendered.replace(
-        "{security_summary}",
-        security.summary() if security is not None else "sandbox on; policy hidden",
+    return "".join(
+        (
+            _SYSTEM_PROMPT_HEAD,
+            str(Path(workdir).expanduser()),
+            _SYSTEM_PROMPT_MIDDLE,
+            security.summary() if security is not None else "sandbox on; policy hidden",
+            _SYSTEM_PROMPT_TAIL,
+            PREDICT_BEFORE_CALL_CLAUSE if predict_before_call_enabled else "",
+        )
     )
-    if predict_before_call_enabled:
-        rendered = rendered + PREDICT_BEFORE_CALL_CLAUSE
-    return rendered
 
 
 def resolve_api_mode(config: Config) -> Literal["chat_completions", "responses"]:
@@ -223,5 +262,109 @@ def resolve_api_mode(config: Config) -> Literal["chat_completions", "responses"]
     return "chat_completions"
 
 
+# One client lives for the whole session, so its pool is sized for long-lived
+# streams plus concurrent follow-ups and keeps idle connections warm between
+# turns. The read timeout is disabled because it bounds the gap between
+# streamed chunks, which can legitimately be long while the model reasons.
+OPENAI_HTTP_LIMITS = httpx.Limits(
+    max_connections=64,
+    max_keepalive_connections=32,
+    keepalive_expiry=120.0,
+)
+OPENAI_HTTP_TIMEOUT = httpx.Timeout(connect=10.0, read=None, write=30.0, pool=10.0)
+
+
 def create_openai_client(config: Config) -> AsyncOpenAI:
-    return AsyncOpenAI(api_key=config.api_key, base_url=config.base_url)
+    """Build the session's OpenAI client on a tuned, reusable connection pool.
+
+    HTTP/2 is enabled only when the optional `h2` package is installed, so
+    concurrent streams can share one connection without making it a hard
+    dependency. The caller owns the returned client and must close it;
+    sessions go through `acquire_openai_client` instead.
+    """
+
+    http_client = DefaultAsyncHttpxClient(
+        limits=OPENAI_HTTP_LIMITS,
+        timeout=OPENAI_HTTP_TIMEOUT,
+        http2=h2 is not None,
+    )
+    return AsyncOpenAI(
+        api_key=config.api_key,
+        base_url=config.base_url,
+        timeout=OPENAI_HTTP_TIMEOUT,
+        http_client=http_client,
+    )
+
+
+class _SharedClient:
+    __slots__ = ("client", "users")
+
+    def __init__(self, client: AsyncOpenAI) -> None:
+        self.client = client
+        self.users = 0
+
+
+# Sessions in one process share a client per (api_key, base_url), so a new
+# session reuses warm connections instead of paying DNS + TCP + TLS again.
+# httpx connections belong to the event loop that opened them, so the loop is
+# part of the key.
+_shared_clients: Dict[
+    Tuple[str, str, Optional[asyncio.AbstractEventLoop]], _SharedClient
+] = {}
+
+
+def _current_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def acquire_openai_client(config: Config) -> AsyncOpenAI:
+    """Return the shared client for `config`'s endpoint, creating it if needed.
+
+    Every call must be paired with `release_openai_client`, which closes the
+    client once its last user lets go.
+    """
+
+    key = (config.api_key, config.base_url, _current_loop())
+    shared = _shared_clients.get(key)
+    if shared is None or shared.client.is_closed():
+        shared = _shared_clients[key] = _SharedClient(create_openai_client(config))
+    shared.users += 1
+    return shared.client
+
+
+async def release_openai_client(client: AsyncOpenAI) -> None:
+    """Drop one use of a client from `acquire_openai_client`."""
+
+    for key, shared in _shared_clients.items():
+        if shared.client is client:
+            shared.users -= 1
+            if shared.users > 0:
+                return
+            del _shared_clients[key]
+            break
+    await client.close()
+
+
+# Provider RPM/TPM limits apply per API key, so every session using the same
+# credentials draws from one limiter rather than each getting the full budget.
+_shared_rate_limiters: Dict[Tuple[str, str], RateLimiter] = {}
+
+
+def shared_rate_limiter(config: Config) -> Optional[RateLimiter]:
+    """Return the process-wide limiter for `config`'s endpoint, if limits are set.
+
+    The first config seen for an (api_key, base_url) pair decides the limits.
+    """
+
+    if not (config.requests_per_minute or config.tokens_per_minute):
+        return None
+    key = (config.api_key, config.base_url)
+    limiter = _shared_rate_limiters.get(key)
+    if limiter is None:
+        limiter = _shared_rate_limiters[key] = RateLimiter(
+            config.requests_per_minute, config.tokens_per_minute
+        )
+    return limiter
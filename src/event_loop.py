@@ -0,0 +1,38 @@
+"""Event loop selection shared by every Gem Code entry point."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Coroutine, TypeVar
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - exercised only when uvloop is absent
+    uvloop = None
+
+T = TypeVar("T")
+
+
+def run_async(coro: Coroutine[Any, Any, T]) -> T:
+    """Run `coro` to completion, on uvloop's libuv event loop when installed.
+
+    The hot paths are socket reads from the model stream and subprocess pipes
+    from `bash`, both of which uvloop schedules with less overhead. Without
+    uvloop (e.g. on Windows) the default asyncio loop is used. Pooled HTTP
+    clients opened on the loop are closed before it shuts down.
+    """
+
+    loop_factory = uvloop.new_event_loop if uvloop is not None else None
+    return asyncio.run(_closing_http_clients(coro), loop_factory=loop_factory)
+
+
+async def _closing_http_clients(coro: Coroutine[Any, Any, T]) -> T:
+    """Await `coro`, then close the loop's pooled HTTP clients before it ends."""
+
+    try:
+        return await coro
+    finally:
+        # Imported here so `main.py --help` does not load the tool stack.
+        from .tool import close_http_clients
+
+        await close_http_clients()
@@ -155,8 +155,9 @@ class JsonlRandomAccess:
                 line = handle.readline()
                 if not line.strip():
                     continue
-                data = json.loads(line.strip())
-                memory_message = Memory_Unit.model_validate(data)
+                # Validate straight from the JSON text, as `load_memory_units`
+                # does, instead of building an intermediate dict first.
+                memory_message = Memory_Unit.model_validate_json(line)
                 if memory_message.type == "compact_boundary":
                     break
                 message = memory_message.to_message()
@@ -23,6 +23,24 @@ class ToolCall(BaseModel):
     function: FunctionCall
     type: str = "function"
 
+    @classmethod
+    def from_stream(
+        cls,
+        call_id: str,
+        name: str,
+        arguments: str,
+        type: str = "function",
+    ) -> "ToolCall":
+        """从流式响应构建工具调用，跳过校验
+
+        字段来自 SDK 已类型化的字符串，流式解析热路径上无需再走 pydantic 校验。
+        """
+        return cls.model_construct(
+            id=call_id,
+            function=FunctionCall.model_construct(name=name, arguments=arguments),
+            type=type,
+        )
+
 
 class Message(BaseModel):
     """聊天消息模型"""
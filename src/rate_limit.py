@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import Callable, Deque, Optional
+
+
+class RateReservation:
+    """One admitted request inside the limiter's rolling window."""
+
+    __slots__ = ("timestamp", "tokens")
+
+    def __init__(self, timestamp: float, tokens: int) -> None:
+        self.timestamp = timestamp
+        self.tokens = tokens
+
+
+class RateLimiter:
+    """Proactive client-side throttle for model requests.
+
+    Relying on the SDK's retries alone means bursts (concurrent sessions,
+    compaction plus a user turn) run into 429s and then back off blindly. This
+    limiter instead admits a request only when it fits in a rolling one-minute
+    window for both request count (RPM) and tokens (TPM). Token use is
+    reserved from a local estimate before the call and corrected with the
+    provider's reported usage afterwards. Sessions share one limiter per
+    credential (see `config.shared_rate_limiter`) so they split that budget.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        *,
+        period: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.period = period
+        self._clock = clock
+        self._window: Deque[RateReservation] = deque()
+        self._window_tokens = 0
+        # Waiters are admitted one at a time so requests keep FIFO order. A
+        # shared limiter can outlive an event loop (the eval runner starts one
+        # per task), and asyncio locks are bound to a loop, so the lock is
+        # recreated whenever the running loop changes.
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _prune(self, now: float) -> None:
+        cutoff = now - self.period
+        window = self._window
+        while window and window[0].timestamp <= cutoff:
+            self._window_tokens -= window.popleft().tokens
+
+    def _fits(self, tokens: int) -> bool:
+        if not self._window:
+            # An empty window always admits, even a request larger than the
+            # whole TPM budget; otherwise it could never run.
+            return True
+        if self.requests_per_minute is not None and len(self._window) >= self.requests_per_minute:
+            return False
+        if self.tokens_per_minute is not None and self._window_tokens + tokens > self.tokens_per_minute:
+            return False
+        return True
+
+    async def acquire(self, estimated_tokens: int = 0) -> RateReservation:
+        """Wait until a request with `estimated_tokens` fits, then reserve it."""
+
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        async with self._lock:
+            while True:
+                now = self._clock()
+                self._prune(now)
+                if self._fits(estimated_tokens):
+                    reservation = RateReservation(now, estimated_tokens)
+                    self._window.append(reservation)
+                    self._window_tokens += estimated_tokens
+                    return reservation
+                # The oldest entry is the next one to leave the window.
+                await asyncio.sleep(max(self._window[0].timestamp + self.period - now, 0.0))
+
+    def settle(self, reservation: RateReservation, actual_tokens: int) -> None:
+        """Replace a reservation's estimate with the provider-reported usage."""
+
+        if reservation in self._window:
+            self._window_tokens += actual_tokens - reservation.tokens
+        reservation.tokens = actual_tokens
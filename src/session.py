@@ -6,22 +6,24 @@ import math
 import os
 import re
 from pathlib import Path
-from typing import Any, Awaitable, Callable, Dict, List, Optional
-from sentence_transformers import SentenceTransformer
+from typing import Any, Awaitable, Callable, Dict, Final, List, Optional
 from rich.console import Console
+from rich.text import Text
 from ulid import ULID
 from uuid import UUID
 
 from .config import (
     Config,
-    create_openai_client,
+    acquire_openai_client,
     get_system_prompt,
+    release_openai_client,
     resolve_api_mode,
+    shared_rate_limiter,
 )
 from .context_manager import Context_Manager
 from .mcp_client import MCPClient, create_mcp_client_with_config, load_mcp_config_from_env
 from .memory import JsonlRandomAccess, Memory_Unit, message_to_memory_unit
-from .models import ContextUsageSnapshot, FunctionCall, Message, ToolCall
+from .models import ContextUsageSnapshot, Message, ToolCall
 from .permissions import (
     PermissionDecision,
     SessionPermissionPolicy,
@@ -31,9 +33,11 @@ from .permissions import (
     make_audit_content,
     normalize_bash_command,
 )
+from .rate_limit import RateLimiter, RateReservation
 from .skill import Skill, SkillTool, format_one_skill_for_prompt, load_skills
 from .tool import (
     clone_tools,
+    close_http_clients,
     formatted_tool_output,
     get_mcp_client,
     parse_tool_arguments,
@@ -51,6 +55,12 @@ from .tool import (
 
 console = Console()
 
+# Fixed banners printed on every model request or tool round are built once as
+# `Text`, which `console.print` renders without markup or emoji parsing.
+_THINKING_BANNER = Text("🤖 Thinking...")
+_OBSERVE_BANNER = Text("👁 OBSERVE")
+_REPEAT_BANNER = Text("🔄 REPEAT")
+
 try:
     import tiktoken
 except ImportError:  # pragma: no cover - exercised only when tiktoken is absent
@@ -58,7 +68,17 @@ except ImportError:  # pragma: no cover - exercised only when tiktoken is absent
 
 
 def _message_to_chat_dict(message: Message) -> Dict[str, Any]:
-    msg: Dict[str, Any] = {"role": message.role, "content": message.content}
+    """Serialize one message for Chat Completions in a canonical shape.
+
+    Providers cache prompt prefixes only when they are byte-identical across
+    requests, so keys are always emitted in the same order (role, content,
+    tool_calls, tool_call_id) and a missing `content` is sent as `""`. Live
+    turns always store a string, while messages rehydrated from transcripts
+    may carry `None`; both must serialize the same way.
+    """
+
+    content = message.content if message.content is not None else ""
+    msg: Dict[str, Any] = {"role": message.role, "content": content}
     if message.tool_calls:
         msg["tool_calls"] = [
             {
@@ -88,6 +108,119 @@ def _assistant_text_to_response_output(text: Optional[str]) -> List[Dict[str, An
     return [{"type": "output_text", "text": text, "annotations": []}]
 
 
+_CJK_CHAR_RE = re.compile(r"[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]")
+
+
+def _heuristic_char_counts(text: str) -> tuple[int, int, int]:
+    """Split `text` into (CJK, ASCII, other) character counts."""
+    cjk_chars = len(_CJK_CHAR_RE.findall(text))
+    ascii_chars = sum(1 for char in text if ord(char) < 128)
+    return cjk_chars, ascii_chars, max(len(text) - cjk_chars - ascii_chars, 0)
+
+
+def _heuristic_token_count(cjk_chars: int, ascii_chars: int, other_chars: int) -> int:
+    # - CJK characters usually map closer to 1 token each.
+    # - ASCII-heavy code and prose are often around 4 chars/token.
+    # - Other Unicode text tends to sit between those two extremes.
+    return cjk_chars + math.ceil(ascii_chars / 4) + math.ceil(other_chars / 2)
+
+
+class _StreamedText:
+    """Text deltas from a model stream, joined once when the stream ends.
+
+    `+=` on the accumulated string copies it on every delta, which is
+    quadratic over a long response. The running token estimate lets the live
+    usage snapshot avoid re-tokenizing everything received so far per chunk.
+    Without a tokenizer (`estimate=None`) the heuristic's character counts are
+    accumulated instead and rounded once, so short deltas are not each
+    rounded up.
+    """
+
+    __slots__ = ("_estimate", "_parts", "_tokens", "_cjk", "_ascii", "_other")
+
+    def __init__(self, estimate: Optional[Callable[[str], int]] = None) -> None:
+        self._estimate = estimate
+        self._parts: List[str] = []
+        self._tokens = 0
+        self._cjk = self._ascii = self._other = 0
+
+    @property
+    def token_estimate(self) -> int:
+        if self._estimate is not None:
+            return self._tokens
+        return _heuristic_token_count(self._cjk, self._ascii, self._other)
+
+    def append(self, delta: str) -> None:
+        self._parts.append(delta)
+        if self._estimate is not None:
+            self._tokens += self._estimate(delta)
+            return
+        cjk_chars, ascii_chars, other_chars = _heuristic_char_counts(delta)
+        self._cjk += cjk_chars
+        self._ascii += ascii_chars
+        self._other += other_chars
+
+    def getvalue(self) -> str:
+        return "".join(self._parts)
+
+
+class _StreamedToolCalls:
+    """Tool calls being assembled from a model stream.
+
+    Argument fragments are collected per call and joined once by `build()`,
+    instead of `+=` re-copying the growing string on every delta. A running
+    token estimate is kept alongside so the live usage snapshot does not
+    re-tokenize the accumulated arguments on every chunk.
+    """
+
+    __slots__ = ("_estimate", "_calls", "_parts", "_tokens", "_last_id", "token_estimate")
+
+    def __init__(self, estimate: Callable[[str], int]) -> None:
+        self._estimate = estimate
+        self._calls: Dict[str, ToolCall] = {}
+        self._parts: Dict[str, List[str]] = {}
+        self._tokens: Dict[str, int] = {}
+        # Id-less fragments continue the most recently touched call; tracking
+        # it directly avoids rescanning the map per chunk.
+        self._last_id: Optional[str] = None
+        self.token_estimate = 0
+
+    def __bool__(self) -> bool:
+        return bool(self._calls)
+
+    def __contains__(self, call_id: str) -> bool:
+        return call_id in self._calls
+
+    def open(self, call_id: str, name: str, arguments: str = "", type: str = "function") -> None:
+        """Start the call `call_id`, replacing anything accumulated for it."""
+        estimate = self._estimate
+        tokens = 12 + estimate(call_id) + estimate(name) + estimate(arguments)
+        self.token_estimate += tokens - self._tokens.get(call_id, 0)
+        self._tokens[call_id] = tokens
+        self._calls[call_id] = ToolCall.from_stream(call_id, name, "", type)
+        self._parts[call_id] = [arguments] if arguments else []
+        self._last_id = call_id
+
+    def append(self, call_id: Optional[str], fragment: str) -> None:
+        """Add an argument fragment; `None` continues the most recent call."""
+        if call_id is None:
+            call_id = self._last_id
+            if call_id is None:
+                return
+        else:
+            self._last_id = call_id
+        tokens = self._estimate(fragment)
+        self._parts[call_id].append(fragment)
+        self._tokens[call_id] += tokens
+        self.token_estimate += tokens
+
+    def build(self) -> List[ToolCall]:
+        """Materialize every call with its joined arguments, in stream order."""
+        for call_id, tool_call in self._calls.items():
+            tool_call.function.arguments = "".join(self._parts[call_id])
+        return list(self._calls.values())
+
+
 # Approval callback contract.
 #
 # The TUI / CLI / non-interactive entry points each pass a closure with this
@@ -147,16 +280,102 @@ def _compute_skills_fingerprint(skills_dir: Optional[str]) -> tuple[int, int]:
     return (deepest, count)
 
 
+# Built-in tool handlers, looked up by name in `Session._dispatch_tool`. Each
+# returns the raw tool output; the dispatcher applies `formatted_tool_output`.
+async def _handle_bash(session: "Session", args: Dict[str, Any], workdir: str) -> str:
+    return await run_bash(
+        args.get("command", ""),
+        workdir,
+        timeout_ms=args.get("timeout_ms", 120000),
+        security_settings=session.config.security,
+    )
+
+
+async def _handle_read_file(session: "Session", args: Dict[str, Any], workdir: str) -> str:
+    return await run_read_file(
+        args.get("path", ""),
+        workdir,
+        start_line=args.get("start_line"),
+        end_line=args.get("end_line"),
+    )
+
+
+async def _handle_write_file(session: "Session", args: Dict[str, Any], workdir: str) -> str:
+    return await run_write_file(args.get("path", ""), args.get("content", ""), workdir)
+
+
+async def _handle_str_replace_file(session: "Session", args: Dict[str, Any], workdir: str) -> str:
+    return await run_str_replace_file(args.get("path", ""), args.get("edits", []), workdir)
+
+
+async def _handle_fetch_url(session: "Session", args: Dict[str, Any], workdir: str) -> str:
+    return await run_fetch_url_to_markdown(
+        args.get("url", ""),
+        security_settings=session.config.security,
+    )
+
+
+async def _handle_glob(session: "Session", args: Dict[str, Any], workdir: str) -> str:
+    return await run_glob(args.get("pattern", ""), workdir, args.get("path"))
+
+
+async def _handle_grep(session: "Session", args: Dict[str, Any], workdir: str) -> str:
+    return await run_grep(
+        pattern=args.get("pattern", ""),
+        path=args.get("path"),
+        glob_pattern=args.get("glob"),
+        file_type=args.get("type"),
+        output_mode=args.get("output_mode", "files_with_matches"),
+        case_insensitive=args.get("-i", False),
+        show_line_numbers=args.get("-n", False),
+        before_context=args.get("-B", 0),
+        after_context=args.get("-A", 0),
+        context=args.get("-C", 0),
+        head_limit=args.get("head_limit"),
+        multiline=args.get("multiline", False),
+        workdir=workdir,
+    )
+
+
+_BUILTIN_TOOL_HANDLERS: Dict[
+    str, Callable[["Session", Dict[str, Any], str], Awaitable[str]]
+] = {
+    "bash": _handle_bash,
+    "read_file": _handle_read_file,
+    "write_file": _handle_write_file,
+    "StrReplaceFile": _handle_str_replace_file,
+    "fetch_url": _handle_fetch_url,
+    "Glob": _handle_glob,
+    "Grep": _handle_grep,
+}
+
+
+# Built-in tools that only read; these may run concurrently within a turn.
+_CONCURRENCY_SAFE_TOOLS: Final[frozenset[str]] = frozenset(
+    {"read_file", "fetch_url", "Glob", "Grep"}
+)
+
+
+def _is_concurrency_safe_tool(name: str) -> bool:
+    """Whether `name` can overlap with other calls from the same turn.
+
+    Skill lookups only return prompt text. MCP tools are opaque and may have
+    side effects, so they are treated like writes.
+    """
+    return name in _CONCURRENCY_SAFE_TOOLS or name.startswith("skill__")
+
+
 class Session:
     def __init__(self, config: Config, memory_access: JsonlRandomAccess):
         self.session_id: UUID = ULID().to_uuid()
         self.config = config
         self.workdir = config.workdir
         self.history: List[Message] = []
-        self.client = create_openai_client(config)
+        self.client = acquire_openai_client(config)
         self.model = config.model
         self.api_mode = resolve_api_mode(config)
         self.skills: List[Skill] = []
+        self._skills_by_name: Dict[str, Skill] = {}
         self.mcp_client: Optional[MCPClient] = None
         self._all_tools: List[Dict[str, Any]] = clone_tools()
         self.encoded_cwd = str(Path(config.workdir).expanduser()).replace("/", "-").lstrip("-")
@@ -174,6 +393,13 @@ class Session:
         self.policy = SessionPermissionPolicy.with_defaults(
             permission_mode=config.permission_mode
         )
+        # Serializes the permission gate when tool calls run concurrently.
+        self._permission_lock = asyncio.Lock()
+        # Optional client-side RPM/TPM throttle (OPENAI_RPM / OPENAI_TPM),
+        # shared with every other session on the same credentials.
+        self._rate_limiter: Optional[RateLimiter] = shared_rate_limiter(config)
+        # Chat Completions payload cache: id(message) -> (message, content, dict).
+        self._chat_dict_cache: Dict[int, tuple[Message, Optional[str], Dict[str, Any]]] = {}
         # Lazy tool/embedding rebuild fingerprint (AC-7). Captured at init and
         # refreshed at the top of `chat()` only when something the rebuild
         # cares about has actually changed.
@@ -198,6 +424,10 @@ class Session:
             # `_initialize_system_prompt` so the embedding map reflects the
             # finalized tool list (built-in + skills + MCP), not just the
             # bare `clone_tools()` baseline.
+            # Imported here: sentence-transformers pulls in torch, which costs
+            # seconds of startup for sessions that never enable tool search.
+            from sentence_transformers import SentenceTransformer
+
             self.embedding_model = SentenceTransformer("embedding_model")
             self.tools_embeddings = None
         else:
@@ -230,16 +460,7 @@ class Session:
             except Exception:
                 pass
 
-        # Heuristic fallback:
-        # - CJK characters usually map closer to 1 token each.
-        # - ASCII-heavy code and prose are often around 4 chars/token.
-        # - Other Unicode text tends to sit between those two extremes.
-        cjk_chars = len(re.findall(r"[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]", text))
-        ascii_chars = sum(1 for char in text if ord(char) < 128)
-        other_chars = max(len(text) - cjk_chars - ascii_chars, 0)
-        ascii_tokens = math.ceil(ascii_chars / 4)
-        other_tokens = math.ceil(other_chars / 2)
-        return cjk_chars + ascii_tokens + other_tokens
+        return _heuristic_token_count(*_heuristic_char_counts(text))
 
     def _estimate_message_tokens(self, message: Message) -> int:
         """Estimate a single message's contribution to the context window."""
@@ -260,20 +481,6 @@ class Session:
 
         return total
 
-    def _estimate_streaming_tool_call_tokens(
-        self,
-        tool_calls: Optional[List[ToolCall]],
-    ) -> int:
-        if not tool_calls:
-            return 0
-        return sum(
-            12
-            + self._estimate_text_tokens(tool_call.id)
-            + self._estimate_text_tokens(tool_call.function.name)
-            + self._estimate_text_tokens(tool_call.function.arguments)
-            for tool_call in tool_calls
-        )
-
     def _estimate_history_tokens(self) -> int:
         request_wrapper_tokens = 12
         return (
@@ -285,9 +492,8 @@ class Session:
     def _recalculate_context_usage(
         self,
         *,
-        streaming_content: str = "",
-        streaming_reasoning: str = "",
-        streaming_tool_calls: Optional[List[ToolCall]] = None,
+        streaming_output_tokens: int = 0,
+        estimated_input_tokens: Optional[int] = None,
         server_total_tokens: Optional[int] = None,
     ) -> None:
         """Recompute the live context snapshot used by the session and TUI.
@@ -296,14 +502,15 @@ class Session:
         is too late for a responsive interface. We therefore estimate the active
         prompt + streamed output locally during generation and overwrite the
         display with provider-reported totals when they arrive.
+
+        Streaming callers pass running estimates: the history does not change
+        while a response streams, so its estimate is computed once per request
+        rather than once per chunk.
         """
 
-        estimated_input_tokens = self._estimate_history_tokens()
-        estimated_output_tokens = (
-            self._estimate_text_tokens(streaming_content)
-            + self._estimate_text_tokens(streaming_reasoning)
-            + self._estimate_streaming_tool_call_tokens(streaming_tool_calls)
-        )
+        if estimated_input_tokens is None:
+            estimated_input_tokens = self._estimate_history_tokens()
+        estimated_output_tokens = streaming_output_tokens
         estimated_total = estimated_input_tokens + estimated_output_tokens
 
         used_tokens = server_total_tokens if server_total_tokens is not None else estimated_total
@@ -319,9 +526,38 @@ class Session:
             server_tokens=server_total_tokens,
         )
 
+    async def _reserve_request_budget(self) -> Optional[RateReservation]:
+        """Wait for the client-side rate limiter before a model request.
+
+        The reservation uses the current input-token estimate; callers settle
+        it with the provider's reported total once the response completes.
+        """
+
+        if self._rate_limiter is None:
+            return None
+        return await self._rate_limiter.acquire(self.context_usage.estimated_input_tokens)
+
+    def _settle_request_budget(
+        self,
+        reservation: Optional[RateReservation],
+        total_tokens: Optional[int],
+    ) -> None:
+        if self._rate_limiter is not None and reservation is not None and total_tokens is not None:
+            self._rate_limiter.settle(reservation, total_tokens)
+
     def get_context_usage_snapshot(self) -> ContextUsageSnapshot:
         return self.context_usage
 
+    def _set_skills(self, skills: List[Skill]) -> None:
+        """Replace the loaded skills and the name index `skill__*` calls use."""
+        self.skills = skills
+        # `setdefault` keeps the first skill of a duplicated name, matching the
+        # order `load_skills` returns them in.
+        by_name: Dict[str, Skill] = {}
+        for skill in skills:
+            by_name.setdefault(skill.name, skill)
+        self._skills_by_name = by_name
+
     async def _initialize_system_prompt(self, skills_dir: Optional[str]) -> None:
         system_prompt = get_system_prompt(
             self.workdir,
@@ -329,7 +565,7 @@ class Session:
             predict_before_call_enabled=self.config.predict_before_call_enabled,
         )
         if skills_dir:
-            self.skills = await load_skills(skills_dir)
+            self._set_skills(await load_skills(skills_dir))
             skill_tools = [
                 SkillTool(skill.name, skill.description).to_openai_function()
                 for skill in self.skills
@@ -423,6 +659,29 @@ class Session:
     async def init(self) -> None:
         await self._init_task
 
+    def _history_to_chat_messages(self) -> List[Dict[str, Any]]:
+        """Return the Chat Completions `messages` payload for `self.history`.
+
+        Past messages never change except through compaction, which either
+        rewrites `content` in place or swaps in new `Message` objects. Each
+        cached dict is therefore reused only while both the message object and
+        its content object are unchanged, and the cache is rebuilt from the
+        current history so entries for dropped messages do not accumulate.
+        """
+
+        cache = self._chat_dict_cache
+        next_cache: Dict[int, tuple[Message, Optional[str], Dict[str, Any]]] = {}
+        messages: List[Dict[str, Any]] = []
+        for message in self.history:
+            key = id(message)
+            entry = cache.get(key)
+            if entry is None or entry[0] is not message or entry[1] is not message.content:
+                entry = (message, message.content, _message_to_chat_dict(message))
+            next_cache[key] = entry
+            messages.append(entry[2])
+        self._chat_dict_cache = next_cache
+        return messages
+
     def _history_to_responses_input(self) -> List[Dict[str, Any]]:
         """Convert local message history into Responses API input items.
 
@@ -537,10 +796,11 @@ class Session:
         self._recalculate_context_usage()
 
         while True:
-            console.print("🤖 Thinking...")
+            console.print(_THINKING_BANNER)
+            reservation = await self._reserve_request_budget()
             stream = await self.client.chat.completions.create(
                 model=self.model,
-                messages=[_message_to_chat_dict(m) for m in self.history],  # type: ignore[arg-type]
+                messages=self._history_to_chat_messages(),  # type: ignore[arg-type]
                 extra_body={"reasoning_split": True},
                 stream=True,
                 tools=search_tool(self._all_tools,self.embedding_model,user_input,self.tools_embeddings) if self.config.use_tool_search else self._all_tools,  # type: ignore[arg-type]
@@ -550,64 +810,81 @@ class Session:
             )
 
             has_tool_calls = False
-            content_buffer = ""
-            reasoning_buffer = ""
-            tool_calls_map: Dict[str, ToolCall] = {}
+            text_estimate = self._estimate_text_tokens if self._token_encoder is not None else None
+            content = _StreamedText(text_estimate)
+            reasoning = _StreamedText(text_estimate)
+            streamed_calls = _StreamedToolCalls(self._estimate_text_tokens)
+            input_tokens = self._estimate_history_tokens()
 
             server_total_tokens: Optional[int] = None
 
+            def update_usage() -> None:
+                self._recalculate_context_usage(
+                    streaming_output_tokens=(
+                        content.token_estimate
+                        + reasoning.token_estimate
+                        + streamed_calls.token_estimate
+                    ),
+                    estimated_input_tokens=input_tokens,
+                    server_total_tokens=server_total_tokens,
+                )
+
+            # Each attribute on an SDK chunk is a pydantic lookup, and streams
+            # run to thousands of chunks, so every field is read once into a
+            # local and reused.
             async for chunk in stream:
-                delta = chunk.choices[0].delta
-                if chunk.usage is not None:
-                    server_total_tokens = chunk.usage.total_tokens
+                usage = chunk.usage
+                if usage is not None:
+                    server_total_tokens = usage.total_tokens
+                choices = chunk.choices
+                if not choices:
+                    # The trailing usage-only chunk carries no delta.
+                    continue
+                delta = choices[0].delta
 
-                if hasattr(delta, "reasoning_details") and delta.reasoning_details:
-                    for detail in delta.reasoning_details:
+                reasoning_details = getattr(delta, "reasoning_details", None)
+                if reasoning_details:
+                    for detail in reasoning_details:
                         if isinstance(detail, dict) and "text" in detail:
                             reasoning_delta = detail["text"]
                             if reasoning_delta and on_reasoning:
                                 on_reasoning(reasoning_delta)
-                            reasoning_buffer += reasoning_delta
+                            reasoning.append(reasoning_delta)
 
-                if delta.content:
-                    content_delta = delta.content
-                    if content_delta:
-                        if on_content:
-                            on_content(content_delta)
-                        content_buffer += content_delta
+                content_delta = delta.content
+                if content_delta:
+                    if on_content:
+                        on_content(content_delta)
+                    content.append(content_delta)
 
-                if delta.tool_calls:
+                tool_call_deltas = delta.tool_calls
+                if tool_call_deltas:
                     has_tool_calls = True
-                    for tool_call in delta.tool_calls:
-                        if tool_call.id:
-                            existing = tool_calls_map.get(tool_call.id)
-                            if existing and tool_call.function.arguments:
-                                existing.function.arguments += tool_call.function.arguments
-                            else:
-                                tool_calls_map[tool_call.id] = ToolCall(
-                                    id=tool_call.id,
-                                    function=FunctionCall(
-                                        name=tool_call.function.name or "",
-                                        arguments=tool_call.function.arguments or "",
-                                    ),
-                                    type=tool_call.type or "function",
-                                )
-                        elif tool_call.function.arguments and tool_calls_map:
-                            last_tool_call = list(tool_calls_map.values())[-1]
-                            last_tool_call.function.arguments += tool_call.function.arguments
-
-                self._recalculate_context_usage(
-                    streaming_content=content_buffer,
-                    streaming_reasoning=reasoning_buffer,
-                    streaming_tool_calls=list(tool_calls_map.values()) if tool_calls_map else None,
-                    server_total_tokens=server_total_tokens,
-                )
+                    for tool_call in tool_call_deltas:
+                        call_id = tool_call.id
+                        function = tool_call.function
+                        fragment = function.arguments
+                        if call_id and call_id not in streamed_calls:
+                            streamed_calls.open(
+                                call_id,
+                                function.name or "",
+                                fragment or "",
+                                tool_call.type or "function",
+                            )
+                        elif fragment:
+                            streamed_calls.append(call_id or None, fragment)
+
+                update_usage()
+
+            update_usage()
+
+            self._settle_request_budget(reservation, server_total_tokens)
 
             await self._handle_model_turn(
-                content_buffer=content_buffer,
-                reasoning_buffer=reasoning_buffer,
+                content_buffer=content.getvalue(),
+                reasoning_buffer=reasoning.getvalue(),
                 has_tool_calls=has_tool_calls,
-                tool_calls=list(tool_calls_map.values()) if has_tool_calls else None,
+                tool_calls=streamed_calls.build() if has_tool_calls else None,
                 user_prompt=user_input,
                 on_turn_end=on_turn_end,
                 on_tool_start=on_tool_start,
@@ -636,7 +913,8 @@ class Session:
         self._recalculate_context_usage()
 
         while True:
-            console.print("🤖 Thinking...")
+            console.print(_THINKING_BANNER)
+            reservation = await self._reserve_request_budget()
             stream = await self.client.responses.create(
                 model=self.model,
                 input=self._history_to_responses_input(),
@@ -646,12 +924,25 @@ class Session:
                 stream=True,
             )
 
-            content_buffer = ""
-            reasoning_buffer = ""
-            tool_calls_by_id: Dict[str, ToolCall] = {}
+            text_estimate = self._estimate_text_tokens if self._token_encoder is not None else None
+            content = _StreamedText(text_estimate)
+            reasoning = _StreamedText(text_estimate)
+            streamed_calls = _StreamedToolCalls(self._estimate_text_tokens)
+            input_tokens = self._estimate_history_tokens()
 
             server_total_tokens: Optional[int] = None
 
+            def update_usage() -> None:
+                self._recalculate_context_usage(
+                    streaming_output_tokens=(
+                        content.token_estimate
+                        + reasoning.token_estimate
+                        + streamed_calls.token_estimate
+                    ),
+                    estimated_input_tokens=input_tokens,
+                    server_total_tokens=server_total_tokens,
+                )
+
             async for event in stream:
                 event_type = getattr(event, "type", "")
 
@@ -662,45 +953,23 @@ class Session:
                     reasoning_delta = getattr(event, "delta", "")
                     if reasoning_delta and on_reasoning:
                         on_reasoning(reasoning_delta)
-                    reasoning_buffer += reasoning_delta
-                    self._recalculate_context_usage(
-                        streaming_content=content_buffer,
-                        streaming_reasoning=reasoning_buffer,
-                        streaming_tool_calls=list(tool_calls_by_id.values()) if tool_calls_by_id else None,
-                        server_total_tokens=server_total_tokens,
-                    )
+                    reasoning.append(reasoning_delta)
+                    update_usage()
                     continue
 
                 if event_type == "response.output_text.delta":
                     content_delta = getattr(event, "delta", "")
                     if content_delta and on_content:
                         on_content(content_delta)
-                    content_buffer += content_delta
-                    self._recalculate_context_usage(
-                        streaming_content=content_buffer,
-                        streaming_reasoning=reasoning_buffer,
-                        streaming_tool_calls=list(tool_calls_by_id.values()) if tool_calls_by_id else None,
-                        server_total_tokens=server_total_tokens,
-                    )
+                    content.append(content_delta)
+                    update_usage()
                     continue
 
                 if event_type == "response.output_item.added":
                     item = getattr(event, "item", None)
                     if getattr(item, "type", None) == "function_call":
-                        tool_calls_by_id[item.call_id] = ToolCall(
-                            id=item.call_id,
-                            function=FunctionCall(
-                                name=item.name,
-                                arguments=item.arguments or "",
-                            ),
-                            type="function",
-                        )
-                    self._recalculate_context_usage(
-                        streaming_content=content_buffer,
-                        streaming_reasoning=reasoning_buffer,
-                        streaming_tool_calls=list(tool_calls_by_id.values()) if tool_calls_by_id else None,
-                        server_total_tokens=server_total_tokens,
-                    )
+                        streamed_calls.open(item.call_id, item.name, item.arguments or "")
+                    update_usage()
                     continue
 
                 if event_type == "response.function_call_arguments.delta":
@@ -710,38 +979,17 @@ class Session:
                     # deterministic accumulation, so we fall back to the opaque
                     # stream item id until the final item arrives.
                     target_id = item_id
-                    if target_id not in tool_calls_by_id:
-                        tool_calls_by_id[target_id] = ToolCall(
-                            id=target_id,
-                            function=FunctionCall(name="", arguments=""),
-                            type="function",
-                        )
-                    tool_calls_by_id[target_id].function.arguments += getattr(event, "delta", "")
-                    self._recalculate_context_usage(
-                        streaming_content=content_buffer,
-                        streaming_reasoning=reasoning_buffer,
-                        streaming_tool_calls=list(tool_calls_by_id.values()) if tool_calls_by_id else None,
-                        server_total_tokens=server_total_tokens,
-                    )
+                    if target_id not in streamed_calls:
+                        streamed_calls.open(target_id, "")
+                    streamed_calls.append(target_id, getattr(event, "delta", ""))
+                    update_usage()
                     continue
 
                 if event_type == "response.output_item.done":
                     item = getattr(event, "item", None)
                     if getattr(item, "type", None) == "function_call":
-                        tool_calls_by_id[item.call_id] = ToolCall(
-                            id=item.call_id,
-                            function=FunctionCall(
-                                name=item.name,
-                                arguments=item.arguments or "",
-                            ),
-                            type="function",
-                        )
-                    self._recalculate_context_usage(
-                        streaming_content=content_buffer,
-                        streaming_reasoning=reasoning_buffer,
-                        streaming_tool_calls=list(tool_calls_by_id.values()) if tool_calls_by_id else None,
-                        server_total_tokens=server_total_tokens,
-                    )
+                        streamed_calls.open(item.call_id, item.name, item.arguments or "")
+                    update_usage()
                     continue
 
                 if event_type == "response.completed":
@@ -749,12 +997,7 @@ class Session:
                     total_tokens = getattr(usage, "total_tokens", None)
                     if total_tokens is not None:
                         server_total_tokens = total_tokens
-                    self._recalculate_context_usage(
-                        streaming_content=content_buffer,
-                        streaming_reasoning=reasoning_buffer,
-                        streaming_tool_calls=list(tool_calls_by_id.values()) if tool_calls_by_id else None,
-                        server_total_tokens=server_total_tokens,
-                    )
+                    update_usage()
                     continue
 
                 if event_type == "response.error":
@@ -765,22 +1008,19 @@ class Session:
                         f"Responses API call failed with status {getattr(event.response, 'status', 'unknown')}"
                     )
 
-            self._recalculate_context_usage(
-                streaming_content=content_buffer,
-                streaming_reasoning=reasoning_buffer,
-                streaming_tool_calls=list(tool_calls_by_id.values()) if tool_calls_by_id else None,
-                server_total_tokens=server_total_tokens,
-            )
+            update_usage()
+
+            self._settle_request_budget(reservation, server_total_tokens)
 
             normalized_tool_calls = [
                 tool_call
-                for tool_call in tool_calls_by_id.values()
+                for tool_call in streamed_calls.build()
                 if tool_call.function.name
             ]
 
             await self._handle_model_turn(
-                content_buffer=content_buffer,
-                reasoning_buffer=reasoning_buffer,
+                content_buffer=content.getvalue(),
+                reasoning_buffer=reasoning.getvalue(),
                 has_tool_calls=bool(normalized_tool_calls),
                 tool_calls=normalized_tool_calls or None,
                 user_prompt=user_input,
@@ -836,42 +1076,83 @@ class Session:
         if not has_tool_calls or not message.tool_calls:
             return
 
+        parsed_calls: List[tuple[ToolCall, str, Dict[str, Any]]] = []
         for tool_call in message.tool_calls:
             args = parse_tool_arguments(tool_call)
             tool_name = tool_call.function.name
+            parsed_calls.append((tool_call, tool_name, args))
 
             if on_tool_start:
                 on_tool_start(tool_name, args)
             else:
                 console.print("")
-                console.print(f"🛠️  Executing tool: {tool_name}")
+                console.print(Text(f"🛠️  Executing tool: {tool_name}"))
+
+        # Read-only tool calls inside one assistant turn are dispatched
+        # concurrently: wall-clock cost is the slowest call rather than the
+        # sum of all calls. Calls that can change the workspace (file writes,
+        # `bash`, MCP tools) run alone and in request order, since e.g. two
+        # `StrReplaceFile` edits to one file would otherwise each read the
+        # original and the later write would drop the earlier edit. Approval
+        # prompts stay sequential because `run_tool` serializes the gate on
+        # `_permission_lock`. Denials come back as `_PermissionDenied`
+        # entries so the bound tool-reply carries the right reason and the
+        # audit entry is recorded on the same path that appends to history.
+        results: List[Any] = []
+        batch: List[tuple[str, Dict[str, Any]]] = []
+
+        async def flush_batch() -> None:
+            if not batch:
+                return
+            results.extend(
+                await asyncio.gather(
+                    *(
+                        self.run_tool(
+                            tool_name,
+                            args,
+                            self.workdir,
+                            request_tool_approval=request_tool_approval,
+                        )
+                        for tool_name, args in batch
+                    ),
+                    return_exceptions=True,
+                )
+            )
+            batch.clear()
 
+        for _, tool_name, args in parsed_calls:
+            if _is_concurrency_safe_tool(tool_name):
+                batch.append((tool_name, args))
+                continue
+            # Finish the read-only calls requested before this one, then run
+            # the mutating call on its own.
+            await flush_batch()
+            batch.append((tool_name, args))
+            await flush_batch()
+        await flush_batch()
+
+        # Replies are appended in the original `tool_calls` order because the
+        # chat protocol expects each `tool_call_id` to follow its request.
+        for (tool_call, tool_name, _), outcome in zip(parsed_calls, results):
             decision_for_audit: Optional[PermissionDecision] = None
             audit_already_emitted = False
-            try:
-                # The gate now lives inside `run_tool`. We still need to
-                # capture the denial decision here so the bound tool-reply
-                # carries the right reason and so the audit entry for the
-                # denial path is recorded on the same code path that emits
-                # the tool-message into `Session.history`.
-                result = await self.run_tool(
-                    tool_name,
-                    args,
-                    self.workdir,
-                    request_tool_approval=request_tool_approval,
-                )
-            except _PermissionDenied as denied:
-                decision_for_audit = denied.decision
-                audit_already_emitted = denied.audit_emitted
+            if isinstance(outcome, _PermissionDenied):
+                decision_for_audit = outcome.decision
+                audit_already_emitted = outcome.audit_emitted
                 # AC-4 protocol invariant: emit a `tool` reply bound to the
                 # original `tool_call_id` so the next API request stays valid.
-                result = f"<user_denied: {denied.decision.reason}>"
+                result = f"<user_denied: {outcome.decision.reason}>"
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                result = outcome
 
             if on_tool_result:
                 on_tool_result(tool_name, result)
             else:
-                console.print("👁 OBSERVE")
-                console.print(f"Result:\n{result}")
+                console.print(_OBSERVE_BANNER)
+                # Raw tool output: no markup parsing, highlighting or wrapping.
+                console.out(f"Result:\n{result}", highlight=False)
                 console.print("")
 
             tool_message = Message(role="tool", content=result, tool_call_id=tool_call.id)
@@ -891,7 +1172,7 @@ class Session:
                 self._emit_permission_audit(tool_name, decision_for_audit)
 
         if not on_tool_start and not on_tool_result:
-            console.print("🔄 REPEAT")
+            console.print(_REPEAT_BANNER)
 
     async def _check_permission(
         self,
@@ -1068,7 +1349,7 @@ class Session:
 
         rebuilt = clone_tools()
         if skills_dir:
-            self.skills = await load_skills(skills_dir)
+            self._set_skills(await load_skills(skills_dir))
             rebuilt.extend(
                 SkillTool(skill.name, skill.description).to_openai_function()
                 for skill in self.skills
@@ -1103,6 +1384,7 @@ class Session:
         self.memory_acess.add_line(memory_unit.model_dump_json())
         self._recalculate_context_usage()
 
+        reservation = await self._reserve_request_budget()
         if self.api_mode == "responses":
             response = await self.client.responses.create(
                 model=self.model,
@@ -1121,13 +1403,17 @@ class Session:
         else:
             response = await self.client.chat.completions.create(
                 model=self.model,
-                messages=[_message_to_chat_dict(m) for m in self.history],  # type: ignore[arg-type]
+                messages=self._history_to_chat_messages(),  # type: ignore[arg-type]
                 extra_body={"reasoning_split": True},
                 tools=self._all_tools,  # type: ignore[arg-type]
                 tool_choice="none",
                 max_tokens=1024 * 16,
             )
             assistant_content = response.choices[0].message.content or ""
+        self._settle_request_budget(
+            reservation,
+            getattr(getattr(response, "usage", None), "total_tokens", None),
+        )
 
         assistant_message = Message(role="assistant", content=assistant_content)
         self.history.append(assistant_message)
@@ -1149,25 +1435,31 @@ class Session:
         # caller of `run_tool` (including future code paths or tests) flows
         # through the chokepoint. `_handle_model_turn` is the only caller in
         # tree today, but the chokepoint guarantee belongs here.
-        try:
-            gate_decision = await self._check_permission(
-                name,
-                args,
-                request_tool_approval=request_tool_approval,
-            )
-        except _PermissionDenied as denied:
-            # AC-9: emit the audit entry for denials at the chokepoint so
-            # direct callers of `run_tool` (not just `_handle_model_turn`)
-            # produce exactly one `[permission]` JSONL line per decision.
-            # Mark the sentinel so `_handle_model_turn` does not double-log.
-            self._emit_permission_audit(name, denied.decision)
-            raise _PermissionDenied(denied.decision, audit_emitted=True) from denied
-        if gate_decision is not None:
-            # Whitelist passes return None; explicit user approvals (allow_once
-            # / allow_session) come back as a decision. Emit the audit entry
-            # for allow decisions immediately so the audit-log invariant
-            # (AC-9) is upheld even when the dispatch below later raises.
-            self._emit_permission_audit(name, gate_decision)
+        #
+        # Concurrent tool calls share one approval surface (a single stdin
+        # prompt or inline TUI widget), and an `allow_session` granted for one
+        # call must be visible to the next call's check. The lock keeps gate
+        # decisions sequential in dispatch order; only execution overlaps.
+        async with self._permission_lock:
+            try:
+                gate_decision = await self._check_permission(
+                    name,
+                    args,
+                    request_tool_approval=request_tool_approval,
+                )
+            except _PermissionDenied as denied:
+                # AC-9: emit the audit entry for denials at the chokepoint so
+                # direct callers of `run_tool` (not just `_handle_model_turn`)
+                # produce exactly one `[permission]` JSONL line per decision.
+                # Mark the sentinel so `_handle_model_turn` does not double-log.
+                self._emit_permission_audit(name, denied.decision)
+                raise _PermissionDenied(denied.decision, audit_emitted=True) from denied
+            if gate_decision is not None:
+                # Whitelist passes return None; explicit user approvals (allow_once
+                # / allow_session) come back as a decision. Emit the audit entry
+                # for allow decisions immediately so the audit-log invariant
+                # (AC-9) is upheld even when the dispatch below later raises.
+                self._emit_permission_audit(name, gate_decision)
         # Dispatch to the actual tool implementation. Kept as a separate
         # method so tests can monkeypatch `_dispatch_tool` to fake tool
         # execution while leaving the gate's chokepoint guarantee intact.
@@ -1181,8 +1473,8 @@ class Session:
     ) -> str:
         try:
             if name.startswith("skill__"):
-                skill_name = name.replace("skill__", "")
-                skill = next((skill for skill in self.skills if skill.name == skill_name), None)
+                skill_name = name.removeprefix("skill__")
+                skill = self._skills_by_name.get(skill_name)
                 if skill:
                     return format_one_skill_for_prompt(skill)
                 return f"Error: Can't find the skill {skill_name}"
@@ -1197,60 +1489,9 @@ class Session:
                 except Exception as exc:
                     return f"Error calling MCP tool {name}: {str(exc)}"
 
-            if name == "bash":
-                output = await run_bash(
-                    args.get("command", ""),
-                    workdir,
-                    timeout_ms=args.get("timeout_ms", 120000),
-                    security_settings=self.config.security,
-                )
-                return formatted_tool_output(output)
-            if name == "read_file":
-                return formatted_tool_output(
-                    await run_read_file(
-                        args.get("path", ""),
-                        workdir,
-                        start_line=args.get("start_line"),
-                        end_line=args.get("end_line"),
-                    )
-                )
-            if name == "write_file":
-                return formatted_tool_output(
-                    await run_write_file(args.get("path", ""), args.get("content", ""), workdir)
-                )
-            if name == "StrReplaceFile":
-                return formatted_tool_output(
-                    await run_str_replace_file(args.get("path", ""), args.get("edits", []), workdir)
-                )
-            if name == "fetch_url":
-                return formatted_tool_output(
-                    await run_fetch_url_to_markdown(
-                        args.get("url", ""),
-                        security_settings=self.config.security,
-                    )
-                )
-            if name == "Glob":
-                return formatted_tool_output(
-                    await run_glob(args.get("pattern", ""), workdir, args.get("path"))
-                )
-            if name == "Grep":
-                return formatted_tool_output(
-                    await run_grep(
-                        pattern=args.get("pattern", ""),
-                        path=args.get("path"),
-                        glob_pattern=args.get("glob"),
-                        file_type=args.get("type"),
-                        output_mode=args.get("output_mode", "files_with_matches"),
-                        case_insensitive=args.get("-i", False),
-                        show_line_numbers=args.get("-n", False),
-                        before_context=args.get("-B", 0),
-                        after_context=args.get("-A", 0),
-                        context=args.get("-C", 0),
-                        head_limit=args.get("head_limit"),
-                        multiline=args.get("multiline", False),
-                        workdir=workdir,
-                    )
-                )
+            handler = _BUILTIN_TOOL_HANDLERS.get(name)
+            if handler is not None:
+                return formatted_tool_output(await handler(self, args, workdir))
 
             return f"Error: Unknown tool: {name}"
         except Exception as exc:
@@ -1265,6 +1506,19 @@ class Session:
             finally:
                 set_mcp_client(None)
                 self.mcp_client = None
+        if self.client is not None:
+            # Other sessions may still share the client; the last release
+            # closes it. Dropping the reference keeps a repeated cleanup from
+            # releasing twice.
+            client, self.client = self.client, None
+            try:
+                await release_openai_client(client)
+            except Exception:
+                pass
+        try:
+            await close_http_clients()
+        except Exception:
+            pass
 
     def get_history(self) -> List[Message]:
         return self.history
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import os
 from dataclasses import dataclass
 from typing import List
@@ -25,16 +26,17 @@ async def load_skills(skills_dir: str) -> List[Skill]:
     skills_dir = os.path.expanduser(skills_dir)
     skills_root = os.path.join(skills_dir, "skills")
 
-    if not os.path.isdir(skills_root):
-        return skills
-
-    for entry in os.listdir(skills_root):
-        path = os.path.join(skills_root, entry, "SKILL.md")
-        if not os.path.isfile(path):
-            continue
+    paths = await asyncio.to_thread(_list_skill_files, skills_root)
+    # Each read is independent, so they run concurrently on worker threads and
+    # startup waits for the slowest file rather than the sum of all of them.
+    contents = await asyncio.gather(
+        *(asyncio.to_thread(_read_text, path) for path in paths),
+        return_exceptions=True,
+    )
+    for path, content in zip(paths, contents):
         try:
-            with open(path, "r", encoding="utf-8") as handle:
-                content = handle.read()
+            if isinstance(content, BaseException):
+                raise content
             skills.append(parse_skill(content))
         except Exception as exc:
             print(f"Error loading skill from '{path}': {str(exc)}")
@@ -42,6 +44,18 @@ async def load_skills(skills_dir: str) -> List[Skill]:
     return skills
 
 
+def _list_skill_files(skills_root: str) -> List[str]:
+    if not os.path.isdir(skills_root):
+        return []
+    paths = (os.path.join(skills_root, entry, "SKILL.md") for entry in os.listdir(skills_root))
+    return [path for path in paths if os.path.isfile(path)]
+
+
+def _read_text(path: str) -> str:
+    with open(path, "r", encoding="utf-8") as handle:
+        return handle.read()
+
+
 def parse_skill(content: str) -> Skill:
     lines = content.splitlines()
     name = ""
@@ -65,27 +79,23 @@ def format_one_skill_for_prompt(skill: Skill) -> str:
 """
 
 
-def format_skill_for_prompt(skills: List[Skill]) -> str:
-    if not skills:
-        return ""
-
-    sections = "\n-----\n".join(
-        f"""
-## {skill.name}
-{skill.description}
-详细说明：
-{skill.content}
-"""
-        for skill in skills
-    )
-    return f"""
+_SKILL_PROMPT_HEADER = """
 你是 Gem Code CLI，拥有以下 skill：
-{sections}
+"""
+_SKILL_PROMPT_FOOTER = """
 
 使用说明：当用户请求与某个 skill 相关时，一定要调用该工具获得 SKILL.md 内容来指导你的回答。
 """
 
 
+def format_skill_for_prompt(skills: List[Skill]) -> str:
+    if not skills:
+        return ""
+
+    sections = "\n-----\n".join(map(format_one_skill_for_prompt, skills))
+    return f"{_SKILL_PROMPT_HEADER}{sections}{_SKILL_PROMPT_FOOTER}"
+
+
 @dataclass
 class SkillTool:
     name: str
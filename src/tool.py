@@ -2,15 +2,17 @@ from __future__ import annotations
 
 import asyncio
 import copy
+import functools
 import glob
 import json
 import os
+import re
+import shutil
 from pathlib import Path
-from typing import Any, Dict, Final, List, Optional
-from sentence_transformers import SentenceTransformer
+from typing import TYPE_CHECKING, Any, Dict, Final, List, Optional
+
+import httpx
 from rich.console import Console
-from trafilatura import extract, fetch_url
-import numpy as np
 from .mcp_client import MCPClient
 from .models import ToolCall
 from .security import (
@@ -19,8 +21,21 @@ from .security import (
     ensure_url_permitted,
 )
 
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only when orjson is absent
+    orjson = None
+
 console = Console()
 
+# Tool arguments can be tens of KB (e.g. `write_file` content), so prefer the
+# native parser when installed. `orjson.JSONDecodeError` subclasses
+# `json.JSONDecodeError`, so one `except` clause covers both.
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 
 def _object_schema(
     properties: Dict[str, Any],
@@ -295,7 +310,11 @@ def clone_tools() -> List[Dict[str, Any]]:
     return copy.deepcopy(TOOLS)
 
 
+@functools.lru_cache(maxsize=32)
 def _workdir_root(workdir: str) -> Path:
+    # Every tool call resolves its workdir, and the session's workdir never
+    # changes, so `expanduser` + `resolve` (one syscall per path component)
+    # runs once per distinct string instead of per call.
     return Path(workdir).expanduser().resolve()
 
 
@@ -332,15 +351,94 @@ def _resolve_path_in_workdir(
     return resolved
 
 
+OUTPUT_TRUNCATE_LENGTH: Final[int] = 32000
+_OUTPUT_HEAD_LENGTH: Final[int] = int(OUTPUT_TRUNCATE_LENGTH * 0.2)
+_OUTPUT_TAIL_LENGTH: Final[int] = int(OUTPUT_TRUNCATE_LENGTH * 0.2)
+
+# `run_bash` keeps at most this much of each stream. Both bounds exceed what
+# `formatted_tool_output` retains, so the model sees the same head and tail
+# while a runaway command (`find /`, a noisy build) no longer buffers
+# everything it prints.
+_CAPTURE_HEAD_BYTES: Final[int] = OUTPUT_TRUNCATE_LENGTH * 2
+_CAPTURE_TAIL_BYTES: Final[int] = OUTPUT_TRUNCATE_LENGTH
+_CAPTURE_READ_SIZE: Final[int] = 64 * 1024
+
+
+class _BoundedCapture:
+    """Keep the first and last bytes of a subprocess stream."""
+
+    __slots__ = ("head", "tail", "omitted")
+
+    def __init__(self) -> None:
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.omitted = 0
+
+    def feed(self, data: bytes) -> None:
+        room = _CAPTURE_HEAD_BYTES - len(self.head)
+        if room > 0:
+            self.head += data[:room]
+            data = data[room:]
+        if data:
+            self.tail += data
+            excess = len(self.tail) - _CAPTURE_TAIL_BYTES
+            if excess > 0:
+                del self.tail[:excess]
+                self.omitted += excess
+
+    def getvalue(self) -> bytes:
+        if not self.omitted:
+            return bytes(self.head + self.tail)
+        # Head and tail are no longer contiguous, so a character cut at either
+        # edge of the gap would decode as U+FFFD or splice into a wrong one.
+        # Trim both to UTF-8 boundaries before joining.
+        head_end = _complete_utf8_length(self.head)
+        tail_start = 0
+        while tail_start < min(3, len(self.tail)) and self.tail[tail_start] & 0xC0 == 0x80:
+            tail_start += 1
+        return bytes(self.head[:head_end] + self.tail[tail_start:])
+
+
+def _complete_utf8_length(data: bytearray) -> int:
+    """Return `len(data)` minus any trailing incomplete UTF-8 sequence."""
+
+    end = len(data)
+    for back in range(1, min(4, end) + 1):
+        byte = data[end - back]
+        if byte & 0xC0 == 0x80:
+            continue  # continuation byte; keep looking for the lead byte
+        if byte >= 0xF0:
+            width = 4
+        elif byte >= 0xE0:
+            width = 3
+        elif byte >= 0xC0:
+            width = 2
+        else:
+            width = 1
+        return end if back >= width else end - back
+    return end
+
+
+async def _drain_stream(stream: Optional[asyncio.StreamReader], sink: _BoundedCapture) -> None:
+    if stream is None:
+        return
+    while chunk := await stream.read(_CAPTURE_READ_SIZE):
+        sink.feed(chunk)
+
+
 def _format_subprocess_result(
     command: str,
     exit_code: int,
     stdout: bytes,
     stderr: bytes,
+    *,
+    omitted_bytes: int = 0,
 ) -> str:
     stdout_text = stdout.decode("utf-8", errors="replace").strip()
     stderr_text = stderr.decode("utf-8", errors="replace").strip()
     parts = [f"$ {command}", f"[exit_code={exit_code}]"]
+    if omitted_bytes:
+        parts.append(f"[output_truncated: {omitted_bytes} bytes omitted during capture]")
     if stdout_text:
         parts.append(stdout_text)
     if stderr_text:
@@ -350,6 +448,35 @@ def _format_subprocess_result(
     return "\n".join(parts)
 
 
+# Commands made only of plain words (no quoting, globbing, expansion,
+# redirection, comments or control operators) mean the same thing with or
+# without a shell, so they can be exec'd directly.
+_PLAIN_COMMAND_RE = re.compile(r"[\w./,:@%+=-]+(?: +[\w./,:@%+=-]+)*")
+# Builtins whose effect only exists inside a shell, or whose standalone
+# binaries (where present) behave differently.
+_SHELL_ONLY_COMMANDS: Final[frozenset[str]] = frozenset({
+    ".", "alias", "bg", "cd", "command", "eval", "exec", "exit", "export",
+    "fg", "getopts", "hash", "jobs", "local", "read", "readonly", "return",
+    "set", "shift", "source", "times", "trap", "type", "ulimit", "umask",
+    "unalias", "unset", "wait",
+})
+
+
+def _plain_command_argv(command: str) -> Optional[List[str]]:
+    """Return `command` as an argv list when it needs no `/bin/sh` to run."""
+
+    if not _PLAIN_COMMAND_RE.fullmatch(command):
+        return None
+    argv = command.split()
+    program = argv[0]
+    if "=" in program or program in _SHELL_ONLY_COMMANDS:
+        return None
+    if "/" in program:
+        # Relative paths would resolve against the tool process's cwd.
+        return argv if os.path.isabs(program) else None
+    return argv if shutil.which(program) is not None else None
+
+
 async def run_bash(
     command: str,
     workdir: str,
@@ -374,25 +501,62 @@ async def run_bash(
             stderr=asyncio.subprocess.PIPE,
         )
     else:
-        proc = await asyncio.create_subprocess_shell(
-            command,
-            cwd=str(_workdir_root(workdir)),
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+        cwd = str(_workdir_root(workdir))
+        proc = None
+        argv = _plain_command_argv(command)
+        if argv is not None:
+            # Skips forking `/bin/sh` just to parse a simple command; a
+            # timeout then also kills the command itself, not only its shell.
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    *argv,
+                    cwd=cwd,
+                    env={**os.environ, "PWD": cwd},
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+            except OSError:
+                # Let the shell report the failure the way users expect.
+                proc = None
+        if proc is None:
+            proc = await asyncio.create_subprocess_shell(
+                command,
+                cwd=cwd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+
+    stdout = _BoundedCapture()
+    stderr = _BoundedCapture()
+
+    async def collect() -> int:
+        await asyncio.gather(
+            _drain_stream(proc.stdout, stdout),
+            _drain_stream(proc.stderr, stderr),
         )
+        return await proc.wait()
 
     try:
-        stdout, stderr = await asyncio.wait_for(
-            proc.communicate(),
-            timeout=timeout_ms / 1000,
-        )
+        exit_code = await asyncio.wait_for(collect(), timeout=timeout_ms / 1000)
     except asyncio.TimeoutError:
         proc.kill()
-        stdout, stderr = await proc.communicate()
-        timeout_result = _format_subprocess_result(command, -1, stdout, stderr)
+        await collect()
+        timeout_result = _format_subprocess_result(
+            command,
+            -1,
+            stdout.getvalue(),
+            stderr.getvalue(),
+            omitted_bytes=stdout.omitted + stderr.omitted,
+        )
         return f"{timeout_result}\n[timeout_ms={timeout_ms}] Command timed out."
 
-    return _format_subprocess_result(command, proc.returncode or 0, stdout, stderr)
+    return _format_subprocess_result(
+        command,
+        exit_code or 0,
+        stdout.getvalue(),
+        stderr.getvalue(),
+        omitted_bytes=stdout.omitted + stderr.omitted,
+    )
 
 
 async def run_read_file(
@@ -410,48 +574,55 @@ async def run_read_file(
     if end_line is not None and effective_start_line > end_line:
         raise ValueError("start_line must be less than or equal to end_line")
 
-    file_path = _resolve_path_in_workdir(workdir, path)
+    def do_read() -> str:
+        # Path resolution stats every component, and splitting a large file
+        # into lines is CPU work, so both run on the worker thread together
+        # with the read; the event loop only sees the finished result.
+        file_path = _resolve_path_in_workdir(workdir, path)
+        content = file_path.read_text(encoding="utf-8")
+        if start_line is None and end_line is None:
+            return content
+
+        # Deterministic line-range read: split the buffer once and slice. The
+        # earlier `async for line in handle` path could spin under some
+        # filesystem layers (Codex's sandbox observed it as a hang), and a
+        # single `read() + splitlines()` is also cheaper for the small files
+        # we expect callers to slice on demand.
+        lines = content.splitlines()
+        total_lines = len(lines)
+        end_index = end_line if end_line is not None else total_lines
+        end_index = min(end_index, total_lines)
+
+        if effective_start_line <= end_index:
+            return "\n".join(
+                f"{line_no}: {lines[line_no - 1]}"
+                for line_no in range(effective_start_line, end_index + 1)
+            )
+
+        requested_end = end_line if end_line is not None else "EOF"
+        return (
+            f"No content found in {file_path} for line range "
+            f"{effective_start_line}-{requested_end}. File has {total_lines} line(s)."
+        )
+
     # Use a worker thread for the actual I/O instead of `aiofiles.open()`.
     # `aiofiles` was observed to hang for line-range reads inside Codex's
     # sandbox; `asyncio.to_thread(Path.read_text)` is deterministic across
     # filesystems and lets pytest hit a real timeout cleanly.
-    content = await asyncio.to_thread(file_path.read_text, encoding="utf-8")
-
-    if start_line is None and end_line is None:
-        return content
-
-    # Deterministic line-range read: split the buffer once and slice. The
-    # earlier `async for line in handle` path could spin under some
-    # filesystem layers (Codex's sandbox observed it as a hang), and a
-    # single `read() + splitlines()` is also cheaper for the small files
-    # we expect callers to slice on demand.
-    lines = content.splitlines()
-    total_lines = len(lines)
-    end_index = end_line if end_line is not None else total_lines
-    end_index = min(end_index, total_lines)
-
-    selected_lines: List[str] = []
-    if effective_start_line <= total_lines:
-        for line_no in range(effective_start_line, end_index + 1):
-            selected_lines.append(f"{line_no}: {lines[line_no - 1]}")
-
-    if selected_lines:
-        return "\n".join(selected_lines)
-
-    requested_end = end_line if end_line is not None else "EOF"
-    return (
-        f"No content found in {file_path} for line range "
-        f"{effective_start_line}-{requested_end}. File has {total_lines} line(s)."
-    )
+    return await asyncio.to_thread(do_read)
 
 
 async def run_write_file(path: str, content: str, workdir: str) -> str:
-    file_path = _resolve_path_in_workdir(workdir, path, allow_create=True)
-    file_path.parent.mkdir(parents=True, exist_ok=True)
+    def do_write() -> Path:
+        resolved = _resolve_path_in_workdir(workdir, path, allow_create=True)
+        resolved.parent.mkdir(parents=True, exist_ok=True)
+        resolved.write_text(content, encoding="utf-8")
+        return resolved
+
     # `Path.write_text` plus `asyncio.to_thread` is deterministic where
-    # `aiofiles.open()` hangs in Codex's sandbox. Behaviour is otherwise
-    # identical: write the full content, return the success summary.
-    await asyncio.to_thread(file_path.write_text, content, encoding="utf-8")
+    # `aiofiles.open()` hangs in Codex's sandbox. Resolution, `mkdir`, and the
+    # write share one worker-thread hop so none of them block the event loop.
+    file_path = await asyncio.to_thread(do_write)
     return f"Successfully wrote {len(content)} characters to {file_path}"
 
 
@@ -462,19 +633,94 @@ async def run_str_replace_file(path: str, edits: List[Dict[str, str]], workdir:
     believes it edited the file while the source tree remains unchanged.
     """
 
-    file_path = _resolve_path_in_workdir(workdir, path)
-    content = await asyncio.to_thread(file_path.read_text, encoding="utf-8")
+    def do_replace() -> Path:
+        # The whole read-modify-write cycle runs on one worker thread: the
+        # replacements scan the full file, which is CPU work the event loop
+        # should not wait on either.
+        resolved = _resolve_path_in_workdir(workdir, path)
+        content = resolved.read_text(encoding="utf-8")
+
+        for edit in edits:
+            target = edit.get("target", "")
+            replacement = edit.get("replacement", "")
+            # One `find` both validates and locates the target; the previous
+            # `in` check followed by `replace` scanned the content twice.
+            index = content.find(target)
+            if index < 0:
+                raise ValueError(f"Target text not found in {resolved}: {target!r}")
+            content = f"{content[:index]}{replacement}{content[index + len(target):]}"
+
+        resolved.write_text(content, encoding="utf-8")
+        return resolved
+
+    file_path = await asyncio.to_thread(do_replace)
+    return f"Successfully applied {len(edits)} replacement(s) to {file_path}"
 
-    for edit in edits:
-        target = edit.get("target", "")
-        replacement = edit.get("replacement", "")
-        if target not in content:
-            raise ValueError(f"Target text not found in {file_path}: {target!r}")
-        content = content.replace(target, replacement, 1)
 
-    await asyncio.to_thread(file_path.write_text, content, encoding="utf-8")
+# Limits mirror trafilatura's own downloader defaults (20MB, 30s), with a few
+# more redirects allowed because each hop is re-checked against the policy.
+_FETCH_MAX_BYTES: Final[int] = 20_000_000
+_FETCH_MAX_REDIRECTS: Final[int] = 5
+_FETCH_TIMEOUT = httpx.Timeout(30.0)
+_FETCH_HEADERS: Final[Dict[str, str]] = {"User-Agent": "gem-code fetch_url"}
+
+# One pooled client per event loop: httpx connections belong to the loop that
+# opened them, and keeping each loop's client reachable (instead of replacing
+# a single global) lets `close_http_clients` close it before that loop ends.
+_fetch_clients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+
+
+def _get_fetch_client() -> httpx.AsyncClient:
+    """Return the pooled client shared by `fetch_url` calls on this loop."""
+
+    loop = asyncio.get_running_loop()
+    client = _fetch_clients.get(loop)
+    if client is None or client.is_closed:
+        # Clients of loops that ended without `close_http_clients` can no
+        # longer be closed; drop them so the dead loops can be collected.
+        for stale in [other for other in _fetch_clients if other.is_closed()]:
+            del _fetch_clients[stale]
+        client = _fetch_clients[loop] = httpx.AsyncClient(
+            headers=_FETCH_HEADERS,
+            timeout=_FETCH_TIMEOUT,
+            follow_redirects=False,
+        )
+    return client
 
-    return f"Successfully applied {len(edits)} replacement(s) to {file_path}"
+
+async def close_http_clients() -> None:
+    """Close the fetch client opened on the current loop, if any."""
+
+    client = _fetch_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+async def _download_html(
+    url: str,
+    security_settings: Optional[SecuritySettings],
+) -> Optional[bytes]:
+    client = _get_fetch_client()
+    for _ in range(_FETCH_MAX_REDIRECTS + 1):
+        async with client.stream("GET", url) as response:
+            if response.is_redirect:
+                # Redirects are followed by hand so every hop goes through the
+                # same URL policy as the original request.
+                url = str(response.url.join(response.headers["location"]))
+                if security_settings is not None:
+                    ensure_url_permitted(url, security_settings)
+                continue
+            if response.status_code != 200:
+                return None
+            body = bytearray()
+            async for chunk in response.aiter_bytes():
+                body += chunk
+                if len(body) > _FETCH_MAX_BYTES:
+                    return None
+            # Return raw bytes: trafilatura's decode_file also honours
+            # <meta charset> and sniffs the encoding, not just the header.
+            return bytes(body)
+    raise ValueError(f"Too many redirects (>{_FETCH_MAX_REDIRECTS})")
 
 
 async def run_fetch_url_to_markdown(
@@ -484,9 +730,13 @@ async def run_fetch_url_to_markdown(
     if security_settings is not None:
         ensure_url_permitted(url, security_settings)
     try:
-        downloaded = await asyncio.to_thread(fetch_url, url)
+        downloaded = await _download_html(url, security_settings)
         if not downloaded:
             return f"Failed to fetch URL {url}: No content received"
+        # trafilatura (and lxml) load on first use rather than at startup.
+        from trafilatura import extract
+
+        # HTML parsing is CPU-bound, so only extraction runs on a worker thread.
         result = await asyncio.to_thread(
             extract,
             downloaded,
@@ -607,24 +857,28 @@ async def run_grep(
         return f"Error executing grep: {str(exc)}"
 
 
-OUTPUT_TRUNCATE_LENGTH: Final[int] = 32000
-
-
 def formatted_tool_output(output: str) -> str:
-    cleaned = output.rstrip("\n")
-    if len(cleaned) > OUTPUT_TRUNCATE_LENGTH:
-        head_len = int(OUTPUT_TRUNCATE_LENGTH * 0.2)
-        tail_len = int(OUTPUT_TRUNCATE_LENGTH * 0.2)
-        head = cleaned[:head_len]
-        tail = cleaned[-tail_len:]
-        skipped = len(cleaned) - head_len - tail_len
-        return f"{head}\n...[{skipped} characters omitted]...\n{tail}"
-    return cleaned
+    # Only the trailing newline run is scanned; oversized outputs are sliced
+    # once for head and tail instead of being copied whole by `rstrip`.
+    end = len(output)
+    while end and output[end - 1] == "\n":
+        end -= 1
+    if end <= OUTPUT_TRUNCATE_LENGTH:
+        return output[:end]
+    head = output[:_OUTPUT_HEAD_LENGTH]
+    tail = output[end - _OUTPUT_TAIL_LENGTH:end]
+    skipped = end - _OUTPUT_HEAD_LENGTH - _OUTPUT_TAIL_LENGTH
+    return f"{head}\n...[{skipped} characters omitted]...\n{tail}"
 
 
 def parse_tool_arguments(toolcall: ToolCall) -> Dict[str, Any]:
+    arguments = toolcall.function.arguments
+    # Argument-less calls stream either nothing or a bare `{}`; neither needs
+    # the parser (and `""` would otherwise be reported as a decode error).
+    if not arguments or arguments == "{}":
+        return {}
     try:
-        return json.loads(toolcall.function.arguments)
+        return _json_loads(arguments)
     except json.JSONDecodeError as exc:
         console.print(f"[red]Error parsing tool arguments: {str(exc)}[/red]")
         return {}
@@ -651,6 +905,8 @@ def search_tool(tools:List[Dict[str, Any]],embedding_model:SentenceTransformer,p
     embeddings=[]
     for embedding in tools_embedding.values():
         embeddings.append(embedding)
+    import numpy as np
+
     embeddings=np.array(embeddings)
     input_embedding = embedding_model.encode([prompt])
     similarity = embedding_model.similarity(input_embedding, embeddings)
@@ -11,12 +11,20 @@ Performance optimized version:
 from __future__ import annotations
 
 import asyncio
+import functools
 import json
-import time
-from dataclasses import dataclass
+import re
+import sys
+import weakref
+from collections import deque
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Final
+from urllib.parse import urlparse
 
+from markdown_it import MarkdownIt
+from markdown_it.token import Token
+from textual import work
 from textual.app import App, ComposeResult
 from textual.containers import Horizontal, Vertical, VerticalScroll, Container
 from textual.widgets import (
@@ -35,11 +43,13 @@ from textual.reactive import reactive
 from textual.binding import Binding
 from textual.message import Message
 from textual.screen import ModalScreen
+from textual.timer import Timer
 from textual.widget import Widget
 from rich.syntax import Syntax
 from rich.text import Text
 
 from .config import Config, load_config
+from .event_loop import run_async
 from .models import ContextUsageSnapshot
 from .permissions import PermissionDecision
 from .session_manager import SessionManager
@@ -49,6 +59,19 @@ from .tool import formatted_tool_output
 BATCH_SIZE: Final[int] = 10          # Update UI every N characters
 BATCH_INTERVAL: Final[float] = 0.02  # Or every 20ms
 MAX_LOG_LINES: Final[int] = 3000     # Keep log size manageable
+STREAM_DRAIN_INTERVAL: Final[float] = 0.05  # Drain streamed chunks at 20 Hz
+INPUT_RESIZE_DEBOUNCE: Final[float] = 0.05  # Resize input after typing settles
+TREE_NODE_BUDGET: Final[int] = 500           # Cap on sidebar file-tree nodes
+MAX_MOUNTED_MESSAGES: Final[int] = 200       # Live message widgets in the chat
+EARLIER_MESSAGES_PAGE: Final[int] = 50       # Messages restored per "show earlier"
+
+# Directory names the sidebar file tree never descends into. Dependency and
+# build output trees are usually the largest in a workspace, so skipping them
+# dominates the scan time. Dot-directories (.git, .venv, ...) are already
+# hidden by the leading-dot check, and files with these names are still shown.
+_TREE_IGNORED_NAMES: Final[frozenset[str]] = frozenset(
+    {"node_modules", "__pycache__", "venv", "dist", "build", "target"}
+)
 
 
 @dataclass
@@ -62,6 +85,101 @@ class ChatEntry:
     tool_args: dict | None = None
     tool_result: str | None = None
     reasoning_content: str | None = None  # 推理/思考内容
+    # HH:MM:SS for the header row, formatted once instead of on every compose.
+    timestamp_str: str = field(init=False, repr=False, compare=False)
+    # Formatted tool blocks, computed on first render. A tool entry is composed
+    # at least twice (call, then result) and again when history is re-mounted;
+    # the result cache remembers its source since `tool_result` is filled in
+    # after construction.
+    _tool_args_display: str | None = field(default=None, init=False, repr=False, compare=False)
+    _tool_result_display: tuple[str, tuple[str, str]] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        self.timestamp_str = _format_clock(self.timestamp)
+
+    def tool_args_display(self) -> str:
+        if self._tool_args_display is None:
+            self._tool_args_display = _format_tool_args_for_display(self.tool_args)
+        return self._tool_args_display
+
+    def tool_result_display(self) -> tuple[str, str]:
+        """Return `(text, lexer)` for `tool_result`, formatted once per result."""
+        result = self.tool_result or ""
+        cached = self._tool_result_display
+        if cached is None or cached[0] is not result:
+            cached = (result, _format_tool_result_for_display(result))
+            self._tool_result_display = cached
+        return cached[1]
+
+
+# (avatar, header) for message roles; anything else falls back to 💬 + ROLE.
+_ROLE_HEADERS: Final[dict[str, tuple[str, str]]] = {
+    "user": ("👤", "YOU"),
+    "assistant": ("🤖", "GEM"),
+}
+
+
+def _format_clock(timestamp: datetime) -> str:
+    """Format `HH:MM:SS` with plain integer formatting rather than strftime."""
+
+    return f"{timestamp.hour:02d}:{timestamp.minute:02d}:{timestamp.second:02d}"
+
+
+class _CachedMarkdownParser:
+    """`MarkdownIt` stand-in handed to Textual's `Markdown` widgets.
+
+    Textual builds a fresh `MarkdownIt("gfm-like")` (rule compilation included)
+    for every update and re-parses the whole source, even when the same text is
+    rendered again, e.g. when history is re-mounted. One shared parser with
+    memoized token streams makes repeat renders a cache hit; Textual only reads
+    the tokens, so sharing them between widgets is safe.
+    """
+
+    def __init__(self) -> None:
+        self._parser = MarkdownIt("gfm-like")
+        self.parse = functools.lru_cache(maxsize=512)(self._parse)
+
+    def _parse(self, src: str) -> list[Token]:
+        return self._parser.parse(src)
+
+    def clear_cache(self) -> None:
+        """Forget memoized token streams, e.g. when the chat is cleared."""
+        self.parse.cache_clear()
+
+
+@functools.lru_cache(maxsize=None)
+def _markdown_parser() -> _CachedMarkdownParser:
+    return _CachedMarkdownParser()
+
+
+def _fenced_text(text: str) -> str:
+    """Wrap `text` in a Markdown code fence so it renders verbatim.
+
+    The fence is one backtick longer than any backtick run inside `text`, so
+    the content cannot close it early.
+    """
+    longest = max((len(run) for run in re.findall(r"`+", text)), default=0)
+    fence = "`" * max(3, longest + 1)
+    return f"{fence}text\n{text}\n{fence}"
+
+
+def _display_host(url: str) -> str:
+    """Return `host[:port]` of an API base URL for the sidebar.
+
+    Parsing with `urlparse` (rather than stripping schemes by hand) also drops
+    any `user:password@` credentials embedded in the URL.
+    """
+    parsed = urlparse(url)
+    host = parsed.hostname
+    if not host:
+        return url
+    try:
+        port = parsed.port
+    except ValueError:
+        port = None
+    return f"{host}:{port}" if port is not None else host
 
 
 def _format_tool_args_for_display(args: dict | None) -> str:
@@ -102,6 +220,86 @@ def _format_tool_result_for_display(result: str) -> tuple[str, str]:
     return cleaned, "text"
 
 
+_TreePlan = list[tuple[str, "_TreePlan | None"]]
+
+
+def _scan_tree(path: str, max_nodes: int = TREE_NODE_BUDGET) -> _TreePlan:
+    """Walk `path` (three levels deep) into `(label, children)` pairs.
+
+    Pure filesystem work with no widget access, so it is safe to run in a
+    worker thread. `children` is `None` for leaves. The walk is breadth-first
+    over an explicit queue and stops once `max_nodes` labels exist, so a huge
+    monorepo costs the same bounded scan as a small project; shallow levels
+    are filled before deeper ones.
+    """
+    import os
+
+    root: _TreePlan = []
+    pending: deque[tuple[_TreePlan, str, int]] = deque([(root, path, 0)])
+    added = 0
+
+    while pending and added < max_nodes:
+        plan, dir_path, depth = pending.popleft()
+        try:
+            dirs = []
+            files = []
+
+            # One scandir pass: DirEntry carries the file type from the
+            # directory read, so we avoid a stat() per entry.
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    name = entry.name
+                    if name.startswith('.'):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if name not in _TREE_IGNORED_NAMES:
+                                dirs.append((name, entry.path))
+                        else:
+                            files.append(name)
+                    except OSError:
+                        pass
+        except (PermissionError, OSError):
+            continue
+
+        # The "... and N more" summaries need full counts, so the walk
+        # still visits every entry; only the survivors are sorted.
+        dirs.sort()
+        files.sort()
+
+        for entry, full_path in dirs[:10]:
+            children: _TreePlan = []
+            plan.append((f"📁 {entry}", children))
+            if depth < 2:
+                pending.append((children, full_path, depth + 1))
+
+        if len(dirs) > 10:
+            plan.append((f"... and {len(dirs) - 10} more folders", []))
+
+        for entry in files[:20]:
+            plan.append((f"📄 {entry}", None))
+
+        if len(files) > 20:
+            plan.append((f"... and {len(files) - 20} more files", None))
+
+        added += len(plan)
+
+    return root
+
+
+def _add_tree_nodes(node, plan: _TreePlan) -> None:
+    """Apply a scan plan to `node`, walking it with an explicit stack."""
+
+    stack = [(node, plan)]
+    while stack:
+        parent, entries = stack.pop()
+        for label, children in entries:
+            if children is None:
+                parent.add_leaf(label)
+            else:
+                stack.append((parent.add(label, expand=False), children))
+
+
 class ThinkingIndicator(Static):
     """Animated thinking indicator"""
     
@@ -122,10 +320,28 @@ class ThinkingIndicator(Static):
     
     dots = reactive(0)
     
-    def on_mount(self) -> None:
-        self.set_interval(0.5, self._animate)
+    def __init__(self, **kwargs):
+        # Only runs while visible; the app is idle between turns most of the
+        # time and a hidden indicator has nothing to animate.
+        self._animation_timer: Timer | None = None
+        super().__init__(**kwargs)
     
-    def _animate(self) -> None:
+    def show(self) -> None:
+        """Make the indicator visible and start animating it."""
+        self.add_class("visible")
+        if self._animation_timer is None:
+            self.update("🤔 Thinking")
+            self._animation_timer = self.set_interval(0.5, self._advance_dots)
+    
+    def hide(self) -> None:
+        """Hide the indicator and stop its animation timer."""
+        self.remove_class("visible")
+        if self._animation_timer is not None:
+            self._animation_timer.stop()
+            self._animation_timer = None
+        self.dots = 0
+    
+    def _advance_dots(self) -> None:
         self.dots = (self.dots + 1) % 4
         self.update(f"🤔 Thinking{'.' * self.dots}")
 
@@ -133,7 +349,9 @@ class ThinkingIndicator(Static):
 class OptimizedStreamingWidget(Static):
     """
     High-performance streaming message widget.
-    Uses RichLog for streaming (fast) then converts to Markdown (pretty).
+    Uses RichLog for streaming (fast); `ChatArea` keeps one instance as a
+    persistent live pane and snapshots each finished response into a
+    `ChatMessageWidget`, which renders it as Markdown (pretty).
     """
     
     DEFAULT_CSS = """
@@ -188,33 +406,52 @@ class OptimizedStreamingWidget(Static):
         border: none;
     }
     
-    OptimizedStreamingWidget .content-container Markdown {
-        background: transparent;
+    OptimizedStreamingWidget .stream-tail {
+        width: 100%;
+        height: auto;
         padding: 0;
     }
     """
     
     def __init__(self, **kwargs):
         self.timestamp = datetime.now()
-        self._content = ""
-        self._buffer = ""  # Buffer for batch updates
-        self._last_update = 0.0
+        self._timestamp_str = _format_clock(self.timestamp)
+        # Both are lists joined on demand; repeated `+=` on long streamed
+        # answers copies the whole string per chunk.
+        self._content_parts: list[str] = []
+        self._buffer: list[str] = []  # Buffer for batch updates
+        self._buffer_len = 0
+        # RichLog.write always starts a new line, so only completed lines are
+        # sealed into the log; the still-growing last line lives in a Static
+        # below it and is the only thing re-rendered per flush.
+        self._open_line = ""
+        self._open_line_rows = 0
+        self._flush_timer: Timer | None = None
         super().__init__(**kwargs)
     
     def compose(self) -> ComposeResult:
-        time_str = self.timestamp.strftime("%H:%M:%S")
-        
         with Horizontal(classes="header-row"):
             yield Label("🤖", classes="avatar")
             yield Label("GEM", classes="header")
-            yield Label(time_str, classes="timestamp")
+            self._timestamp_label = Label(self._timestamp_str, classes="timestamp")
+            yield self._timestamp_label
         
         with Container(classes="content-container"):
             # Use RichLog for high-performance streaming
             # markup=False to avoid parsing [] as Rich markup (fixes MarkupError with code)
-            self._log = RichLog(highlight=True, markup=False, auto_scroll=True)
+            # highlight=False skips Rich's regex highlighter on every flush; the
+            # styled render happens once, as Markdown in the final ChatMessageWidget.
+            self._log = RichLog(
+                highlight=False,
+                markup=False,
+                auto_scroll=True,
+                wrap=True,
+                min_width=0,
+            )
             self._log.max_lines = MAX_LOG_LINES
             yield self._log
+            self._tail = Static("", classes="stream-tail", markup=False)
+            yield self._tail
     
     def append_text(self, text: str) -> None:
         """
@@ -223,14 +460,28 @@ class OptimizedStreamingWidget(Static):
         """
         if not self.is_mounted:
             return
-        self._buffer += text
-        now = time.monotonic()
-        
-        # Batch by size or time
-        buffer_len = len(self._buffer)
-        time_since_update = now - self._last_update
-        
-        if buffer_len >= BATCH_SIZE or time_since_update >= BATCH_INTERVAL:
+        self._buffer.append(text)
+        self._buffer_len += len(text)
+        # Size-triggered flush only; the time-based flush is the widget's own
+        # interval timer, so the hot path never reads the clock.
+        if self._buffer_len >= BATCH_SIZE:
+            self.flush()
+
+    def on_mount(self) -> None:
+        # The pane lives for the whole session, so the flush timer only runs
+        # while a response streams; nothing ticks while the app is idle.
+        self._flush_timer = self.set_interval(BATCH_INTERVAL, self._tick_flush, pause=True)
+
+    def resume_flushing(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.resume()
+
+    def pause_flushing(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.pause()
+
+    def _tick_flush(self) -> None:
+        if self._buffer_len:
             self.flush()
     
     def flush(self) -> None:
@@ -239,33 +490,53 @@ class OptimizedStreamingWidget(Static):
             return
         if self._buffer:
             try:
-                self._content += self._buffer
-                self._log.write(self._buffer)
-                self._buffer = ""
-                self._last_update = time.monotonic()
+                chunk = "".join(self._buffer)
+                self._buffer.clear()
+                self._buffer_len = 0
+                self._content_parts.append(chunk)
+                sealed, newline, self._open_line = (self._open_line + chunk).rpartition("\n")
+                if newline:
+                    self._log.write(sealed)
+                self._update_open_line()
             except Exception:
                 pass  # Log may have been removed
     
-    def finalize(self) -> None:
-        """
-        Convert RichLog to Markdown for better formatting.
-        This is called when streaming is complete.
+    def _update_open_line(self) -> None:
+        """Repaint the open line, re-running layout only if its height changes.
+
+        A layout pass re-arranges the whole chat area; while the open line
+        keeps the same number of wrapped rows only the line itself is damaged.
         """
-        try:
-            self.flush()
-            
-            # Get the container
-            container = self.query_one(".content-container", Container)
-            
-            # Remove RichLog
-            if self._log and self._log.is_mounted:
-                self._log.remove()
-            
-            # Add Markdown for final rendering
-            container.mount(Markdown(self._content or "", classes="content"))
-        except Exception as e:
-            # Log error but don't crash
-            print(f"Error finalizing streaming widget: {e}")
+        tail = self._tail
+        tail.update(self._open_line, layout=False)
+        width = tail.content_size.width
+        if width <= 0:
+            # Not laid out yet, so there is no height to compare against.
+            tail.refresh(layout=True)
+            return
+        rows = tail.visual.get_height(tail.styles, width) if self._open_line else 0
+        if rows != self._open_line_rows:
+            self._open_line_rows = rows
+            tail.refresh(layout=True)
+    
+    @property
+    def content(self) -> str:
+        """Everything streamed so far, including text still in the buffer."""
+        return "".join(self._content_parts) + "".join(self._buffer)
+    
+    def reset(self) -> None:
+        """Drop the previous response so the pane can stream the next one."""
+        self._content_parts.clear()
+        self._buffer.clear()
+        self._buffer_len = 0
+        self._open_line = ""
+        self._open_line_rows = 0
+        self.timestamp = datetime.now()
+        self._timestamp_str = _format_clock(self.timestamp)
+        if self.is_mounted:
+            self._timestamp_label.update(self._timestamp_str)
+            self._log.clear()
+            self._tail.update("")
 
 
 class ChatMessageWidget(Static):
@@ -407,32 +678,30 @@ class ChatMessageWidget(Static):
         self.add_class(entry.role)
     
     def compose(self) -> ComposeResult:
-        time_str = self.entry.timestamp.strftime("%H:%M:%S")
-        
         # Determine avatar and header text
         if self.entry.is_tool_call and self.entry.tool_name:
-            avatar = "🔧"
-            header_text = self.entry.tool_name.upper()
-        elif self.entry.role == "user":
-            avatar = "👤"
-            header_text = "YOU"
-        elif self.entry.role == "assistant":
-            avatar = "🤖"
-            header_text = "GEM"
+            avatar, header_text = "🔧", self.entry.tool_name.upper()
         else:
-            avatar = "💬"
-            header_text = self.entry.role.upper()
+            role_header = _ROLE_HEADERS.get(self.entry.role)
+            if role_header is not None:
+                avatar, header_text = role_header
+            else:
+                avatar, header_text = "💬", self.entry.role.upper()
         
         # Header row
         with Horizontal(classes="header-row"):
             yield Label(avatar, classes="avatar")
             yield Label(Text(header_text), classes="header")
-            yield Label(time_str, classes="timestamp")
+            yield Label(self.entry.timestamp_str, classes="timestamp")
         
         # 推理内容 - 使用 Collapsible 折叠显示（仅 assistant 角色）
         if self.entry.role == "assistant" and self.entry.reasoning_content:
             with Collapsible(title="🤔 Thinking...", collapsed=True, classes="reasoning-collapsible"):
-                yield Markdown(self.entry.reasoning_content, classes="reasoning-content")
+                yield Markdown(
+                    self.entry.reasoning_content,
+                    classes="reasoning-content",
+                    parser_factory=_markdown_parser,
+                )
 
         if self.entry.is_tool_call:
             # Tool call messages are rendered as structured panels instead of a
@@ -446,7 +715,7 @@ class ChatMessageWidget(Static):
                 yield Static("Arguments", classes="tool-block-title")
                 yield Static(
                     Syntax(
-                        _format_tool_args_for_display(self.entry.tool_args),
+                        self.entry.tool_args_display(),
                         "json",
                         word_wrap=True,
                         line_numbers=False,
@@ -457,7 +726,7 @@ class ChatMessageWidget(Static):
                 )
 
             if self.entry.tool_result:
-                result_text, lexer = _format_tool_result_for_display(self.entry.tool_result)
+                result_text, lexer = self.entry.tool_result_display()
                 yield Static("Result", classes="tool-block-title")
                 yield Static(
                     Syntax(
@@ -474,7 +743,7 @@ class ChatMessageWidget(Static):
 
         # Message content with Markdown
         content = self.entry.content or ""
-        yield Markdown(content, classes="content")
+        yield Markdown(content, classes="content", parser_factory=_markdown_parser)
 
 
 class ChatArea(VerticalScroll):
@@ -488,30 +757,139 @@ class ChatArea(VerticalScroll):
         border: none;
         background: $surface;
     }
+    
+    ChatArea #show-earlier {
+        width: 100%;
+        margin: 0 2 1 2;
+    }
     """
     
     _current_streaming: OptimizedStreamingWidget | None = None
     
+    def __init__(self, **kwargs):
+        # Entries whose widgets were unmounted to keep the live widget count
+        # bounded, oldest first. They stay raw `ChatEntry`s (no Markdown parse)
+        # until the user asks to see them again.
+        self._earlier_entries: list[ChatEntry] = []
+        self._message_limit = MAX_MOUNTED_MESSAGES
+        # Removal completes asynchronously; pruned widgets stay in `children`
+        # until then and must not be counted (or pruned) twice.
+        self._pruned_widgets: weakref.WeakSet[ChatMessageWidget] = weakref.WeakSet()
+        super().__init__(**kwargs)
+    
+    def compose(self) -> ComposeResult:
+        self._show_earlier = Button("", id="show-earlier", variant="default")
+        self._show_earlier.display = False
+        yield self._show_earlier
+        # One streaming pane lives at the bottom for the app's lifetime and is
+        # reset per response, instead of building and tearing down a widget
+        # tree (CSS, RichLog, timers) for every turn.
+        self._live_pane = OptimizedStreamingWidget(id="live-pane")
+        self._live_pane.display = False
+        yield self._live_pane
+    
+    def on_mount(self) -> None:
+        # Anchoring keeps the view pinned to the bottom as content grows, with
+        # the offset applied during layout, so new messages and streamed
+        # deltas need no scroll request of their own. Scrolling up releases
+        # the anchor, so output no longer pulls the user back down.
+        self.anchor()
+    
+    def mount_message(
+        self, widget: ChatMessageWidget, *, after: Widget | None = None
+    ) -> None:
+        """Mount a message widget, keeping the live pane last."""
+        if after is not None and after.is_mounted:
+            self.mount(widget, after=after)
+        else:
+            self.mount(widget, before=self._live_pane)
+    
+    def replace_message(self, old: ChatMessageWidget, new: ChatMessageWidget) -> None:
+        """Swap `old` for `new` in place, e.g. a tool call once its result lands."""
+        if not old.is_mounted or old in self._pruned_widgets:
+            # `old` was pruned and its (mutated) entry already sits in
+            # `_earlier_entries`; "show earlier" renders it from there.
+            return
+        self.mount_message(new, after=old)
+        self._pruned_widgets.add(old)
+        old.remove()
+    
     def add_message(self, entry: ChatEntry) -> ChatMessageWidget:
         """Add a new message to the chat"""
         widget = ChatMessageWidget(entry)
-        self.mount(widget)
-        self.scroll_end(animate=False)
+        self.mount_message(widget)
+        self._prune_earlier_messages()
         return widget
     
+    def _prune_earlier_messages(self) -> None:
+        """Unmount the oldest message widgets beyond the live limit.
+
+        Layout and memory cost grow with every mounted widget, so long sessions
+        keep only the most recent messages live.
+        """
+        widgets = [
+            child
+            for child in self.children
+            if isinstance(child, ChatMessageWidget) and child not in self._pruned_widgets
+        ]
+        excess = len(widgets) - self._message_limit
+        if excess <= 0:
+            return
+        pruned = widgets[:excess]
+        self._pruned_widgets.update(pruned)
+        self._earlier_entries.extend(widget.entry for widget in pruned)
+        self.remove_children(pruned)
+        self._update_show_earlier()
+    
+    def show_earlier_messages(self) -> None:
+        """Re-mount the most recent page of unmounted earlier messages."""
+        if not self._earlier_entries:
+            return
+        page = self._earlier_entries[-EARLIER_MESSAGES_PAGE:]
+        del self._earlier_entries[-len(page):]
+        # The user asked for these, so the next new message must not prune
+        # them straight away.
+        self._message_limit += len(page)
+        self.mount_all([ChatMessageWidget(entry) for entry in page], after=self._show_earlier)
+        self._update_show_earlier()
+    
+    def _update_show_earlier(self) -> None:
+        count = len(self._earlier_entries)
+        self._show_earlier.label = f"▲ Show earlier messages ({count} hidden)"
+        self._show_earlier.display = count > 0
+    
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        if event.button.id == "show-earlier":
+            event.stop()
+            self.show_earlier_messages()
+    
     def start_streaming(self) -> OptimizedStreamingWidget:
         """Start a new streaming message"""
-        self._current_streaming = OptimizedStreamingWidget()
-        self.mount(self._current_streaming)
-        self.scroll_end(animate=False)
-        return self._current_streaming
+        pane = self._live_pane
+        pane.reset()
+        pane.display = True
+        pane.resume_flushing()
+        self._current_streaming = pane
+        return pane
+    
+    def end_streaming(self) -> None:
+        """Hide the live pane without keeping its content."""
+        self._current_streaming = None
+        self._live_pane.display = False
+        self._live_pane.pause_flushing()
     
     def finish_streaming(self) -> None:
-        """Mark current streaming message as complete and convert to Markdown"""
+        """Snapshot the live pane into an assistant message rendered as Markdown"""
         if self._current_streaming:
-            self._current_streaming.finalize()
-            self._current_streaming = None
-        self.scroll_end(animate=False)
+            pane = self._current_streaming
+            content = pane.content
+            self.end_streaming()
+            if content:
+                self.add_message(ChatEntry(
+                    role="assistant",
+                    content=content,
+                    timestamp=pane.timestamp,
+                ))
     
     def append_streaming(self, text: str) -> None:
         """Append text to current streaming widget"""
@@ -531,15 +909,31 @@ class ChatArea(VerticalScroll):
     
     def clear(self) -> None:
         """Clear all messages"""
-        for child in list(self.children):
-            child.remove()
-        self._current_streaming = None
+        # Drop the streaming reference first so an in-flight flush is a no-op,
+        # then unmount everything but the live pane in one batch instead of
+        # one remove per child.
+        self.end_streaming()
+        self._live_pane.reset()
+        # Cached token streams belong to the history being discarded.
+        _markdown_parser().clear_cache()
+        self._earlier_entries.clear()
+        self._message_limit = MAX_MOUNTED_MESSAGES
+        self._update_show_earlier()
+        self.remove_children(
+            [
+                child
+                for child in self.children
+                if child is not self._live_pane and child is not self._show_earlier
+            ]
+        )
 
 
 class ResponseMessage(Message):
     """Message for streaming response updates"""
     def __init__(self, chunk: str | None = None, done: bool = False, error: str | None = None) -> None:
-        self.chunk = chunk  # None means just a flush request
+        # Only the new text since the previous message, never the accumulated
+        # response; None means just a flush request.
+        self.chunk = chunk
         self.done = done
         self.error = error
         super().__init__()
@@ -633,6 +1027,10 @@ class InputArea(Container):
         """Message sent when user wants to clear history"""
         pass
     
+    def __init__(self, **kwargs):
+        self._resize_timer: Timer | None = None
+        super().__init__(**kwargs)
+    
     def compose(self) -> ComposeResult:
         with Horizontal(id="input-row"):
             text_area = TextArea(
@@ -654,22 +1052,35 @@ class InputArea(Container):
         )
     
     def on_mount(self) -> None:
-        text_area = self.query_one("#message-input", TextArea)
-        text_area.focus()
+        self._text_area = self.query_one("#message-input", TextArea)
+        self._send_button = self.query_one("#send-btn", Button)
+        self._text_area.focus()
         # Set initial height
-        text_area.styles.height = 3
+        self._text_area.styles.height = 3
     
     def on_text_area_changed(self, event: TextArea.Changed) -> None:
-        """Auto-resize textarea based on content"""
-        text_area = event.text_area
-        lines = text_area.text.count('\n') + 1
+        """Auto-resize textarea based on content, once typing settles.
+
+        Changed fires per keystroke; resizing each time forces a reflow, which
+        makes typing and large pastes lag.
+        """
+        if self._resize_timer is not None:
+            self._resize_timer.stop()
+        self._resize_timer = self.set_timer(INPUT_RESIZE_DEBOUNCE, self._apply_resize)
+    
+    def _apply_resize(self) -> None:
+        self._resize_timer = None
+        text_area = self._text_area
         # Height between 3 and 10 lines
-        new_height = min(max(lines, 3), 10)
+        new_height = min(max(text_area.document.line_count, 3), 10)
+        current = text_area.styles.height
+        if current is not None and current.value == new_height:
+            return
         text_area.styles.height = new_height
     
     def _send_message(self) -> None:
         """Send the current message"""
-        text_area = self.query_one("#message-input", TextArea)
+        text_area = self._text_area
         value = text_area.text.strip()
         if value:
             self.post_message(self.Submitted(value))
@@ -686,11 +1097,11 @@ class InputArea(Container):
     
     def set_loading(self, loading: bool) -> None:
         """Show/hide loading state"""
-        btn = self.query_one("#send-btn", Button)
+        btn = self._send_button
         btn.disabled = loading
         btn.label = "Wait..." if loading else "Send ⏎"
         
-        text_area = self.query_one("#message-input", TextArea)
+        text_area = self._text_area
         text_area.disabled = loading
         if not loading:
             text_area.focus()
@@ -767,7 +1178,11 @@ class Sidebar(Container):
         self.config = config
         self.context_label = None
         self.context_detail_label = None
+        self.file_tree: Tree[dict] | None = None
         super().__init__(**kwargs)
+
+    def on_mount(self) -> None:
+        self._populate_tree()
     
     def update_context_usage(self, snapshot: ContextUsageSnapshot) -> None:
         """Update the sidebar with the latest context estimate or server usage."""
@@ -817,7 +1232,7 @@ class Sidebar(Container):
             
             with Vertical(classes="info-row"):
                 yield Label("API:", classes="info-label")
-                domain = self.config.base_url.replace("https://", "").replace("http://", "").split("/")[0]
+                domain = _display_host(self.config.base_url)
                 yield Label(Text(domain[:25]), classes="info-value")
         
         # Workdir info
@@ -854,8 +1269,9 @@ class Sidebar(Container):
             yield Label("FILES", classes="section-title")
             tree: Tree[dict] = Tree("📁 " + self._get_dir_name(self.config.workdir))
             tree.root.expand()
+            tree.root.add_leaf("Loading…")
+            self.file_tree = tree
             yield tree
-            self._populate_tree(tree)
     
     def _get_dir_name(self, path: str) -> str:
         """Get directory name from path"""
@@ -863,50 +1279,28 @@ class Sidebar(Container):
         name = os.path.basename(path) or path
         return name[:25] + "..." if len(name) > 28 else name
     
-    def _populate_tree(self, tree: Tree) -> None:
-        """Populate file tree with working directory contents"""
+    @work(exclusive=True, group="file-tree")
+    async def _populate_tree(self) -> None:
+        """Populate file tree with working directory contents.
+
+        The directory walk runs in a thread so a slow or large workspace never
+        holds up the first frame; the tree shows a placeholder until the scan
+        result is applied on the event loop.
+        """
         import os
-        
+
         # Expand ~ to full path
         workdir = os.path.expanduser(self.config.workdir)
-        
-        def add_directory(node, path: str, depth: int = 0) -> None:
-            if depth > 2:
-                return
-            try:
-                entries = sorted(os.listdir(path))
-                dirs = []
-                files = []
-                
-                for entry in entries:
-                    if entry.startswith('.') or entry in ['node_modules', '__pycache__', '.venv', 'venv']:
-                        continue
-                    full_path = os.path.join(path, entry)
-                    try:
-                        if os.path.isdir(full_path):
-                            dirs.append((entry, full_path))
-                        else:
-                            files.append(entry)
-                    except (PermissionError, OSError):
-                        pass
-                
-                for entry, full_path in dirs[:10]:
-                    dir_node = node.add(f"📁 {entry}", expand=False)
-                    add_directory(dir_node, full_path, depth + 1)
-                
-                if len(dirs) > 10:
-                    node.add(f"... and {len(dirs) - 10} more folders")
-                
-                for entry in files[:20]:
-                    node.add_leaf(f"📄 {entry}")
-                
-                if len(files) > 20:
-                    node.add_leaf(f"... and {len(files) - 20} more files")
-                    
-            except (PermissionError, OSError):
-                pass
-        
-        add_directory(tree.root, workdir)
+        plan = await asyncio.to_thread(_scan_tree, workdir)
+
+        tree = self.file_tree
+        if tree is None:
+            return
+        # Every add() schedules tree bookkeeping and a refresh; applying the
+        # whole plan inside one batch paints the finished tree once.
+        with self.app.batch_update():
+            tree.root.remove_children()
+            _add_tree_nodes(tree.root, plan)
 
 
 class StatusBar(Static):
@@ -978,22 +1372,22 @@ class HelpScreen(ModalScreen):
         Binding("escape,space,q", "dismiss", "Close"),
     ]
     
+    SHORTCUTS: Final[tuple[tuple[str, str], ...]] = (
+        ("Enter", "Insert new line"),
+        ("Ctrl+Enter", "Send message"),
+        ("Ctrl+C", "Quit application"),
+        ("Ctrl+L", "Clear chat history"),
+        ("Ctrl+S", "Toggle sidebar"),
+        ("Escape", "Focus input"),
+        ("?", "Show this help"),
+    )
+    
     def compose(self) -> ComposeResult:
         with Container():
             yield Label("⌨️  Keyboard Shortcuts", classes="title")
             yield Rule()
             
-            shortcuts = [
-                ("Enter", "Insert new line"),
-                ("Ctrl+Enter", "Send message"),
-                ("Ctrl+C", "Quit application"),
-                ("Ctrl+L", "Clear chat history"),
-                ("Ctrl+S", "Toggle sidebar"),
-                ("Escape", "Focus input"),
-                ("?", "Show this help"),
-            ]
-            
-            for key, desc in shortcuts:
+            for key, desc in self.SHORTCUTS:
                 with Horizontal(classes="key-row"):
                     yield Label(key, classes="key")
                     yield Label(desc, classes="desc")
@@ -1351,28 +1745,58 @@ class GemCodeApp(App):
         self.session_manager: SessionManager | None = None
         self._is_generating = False
         self._sidebar_visible = True
-        self._current_tool_widget = None  # Track current tool widget for updates
+        # Tool widgets awaiting their result. Tool calls within one turn run
+        # concurrently, so every start arrives before the first result; results
+        # are reported in the same order, which makes FIFO matching exact.
+        self._pending_tool_widgets: deque[ChatMessageWidget] = deque()
+        # Content deltas land here and are drained at most once per
+        # STREAM_DRAIN_INTERVAL, so UI work is bounded by the drain rate rather
+        # than the provider's token rate. The timer is armed by the first chunk
+        # of a frame, so nothing ticks while the app is idle.
+        self._chunk_buffer: list[str] = []
+        self._drain_timer: Timer | None = None
+        # Session init runs in a worker after first paint; messages submitted
+        # before it finishes wait here instead of being dropped.
+        self._session_ready = False
+        self._pending_submissions: deque[str] = deque()
         super().__init__()
     
-    async def on_mount(self) -> None:
+    def on_mount(self) -> None:
+        """Paint immediately and initialize the session in the background."""
+        # The layout is fixed once composed, so resolve the widgets the
+        # streaming and status callbacks touch once instead of running a DOM
+        # query on every frame, tick, and tool event.
+        self._chat_area = self.query_one("#chat-area", ChatArea)
+        self._input_area = self.query_one("#input-area", InputArea)
+        self._thinking_indicator = self.query_one("#thinking-indicator", ThinkingIndicator)
+        self._status_bar = self.query_one(StatusBar)
+        self._sidebar = self.query_one("#sidebar", Sidebar)
+        self._status_bar.status = "Initializing..."
+        # Poll frequently so the context meter visibly changes during
+        # streaming even before the provider sends a final `usage` block.
+        self.set_interval(0.25, self._update_context_display)
+        self._init_session()
+    
+    @work(exclusive=True, group="session-init")
+    async def _init_session(self) -> None:
         """Initialize session state and surface startup failures clearly.
 
         Textual startup exceptions can be easy to miss because the app switches
         to an alternate screen. We therefore update the status bar immediately,
         keep the exception text visible via `notify()`, and then re-raise so the
-        CLI wrapper can print a plain error message as well.
+        worker failure exits the app and the CLI wrapper can print a plain error
+        message as well.
         """
 
         try:
             self.session_manager = SessionManager(self.config)
             await self.session_manager.init()
-            self.query_one(StatusBar).status = f"Ready • {self.config.model}"
-            # Poll frequently so the context meter visibly changes during
-            # streaming even before the provider sends a final `usage` block.
-            self.set_interval(0.25, self._update_context_display)
+            self._session_ready = True
+            self._status_bar.status = f"Ready • {self.config.model}"
             self._update_context_display()
+            self._submit_next_pending()
         except Exception as exc:
-            self.query_one(StatusBar).status = "Startup error"
+            self._status_bar.status = "Startup error"
             self.notify(
                 f"TUI startup failed: {exc}",
                 title="Startup Error",
@@ -1380,14 +1804,38 @@ class GemCodeApp(App):
             )
             raise
     
+    def _queue_chunk(self, chunk: str) -> None:
+        """Buffer a content delta and arm the drain timer for this frame."""
+        self._chunk_buffer.append(chunk)
+        if self._drain_timer is None:
+            self._drain_timer = self.set_timer(STREAM_DRAIN_INTERVAL, self._drain_chunks)
+    
+    def _drain_chunks(self) -> None:
+        """Append all buffered content deltas to the streaming widget at once.
+
+        Called by the frame timer, and directly at turn end or on error so the
+        final tokens are never held back by the timer.
+        """
+        if self._drain_timer is not None:
+            self._drain_timer.stop()
+            self._drain_timer = None
+        if not self._chunk_buffer or not self.is_running:
+            return
+        chunks, self._chunk_buffer = self._chunk_buffer, []
+        self._chat_area.append_streaming("".join(chunks))
+
     def _update_context_display(self) -> None:
         """Update context usage display in sidebar and status bar"""
+        # The 0.25s poll can still tick while shutdown prunes screens and awaits
+        # session cleanup, after the widgets it updates are gone.
+        if not self.is_running or not self._session_ready:
+            return
         if self.session_manager and self.session_manager.session:
             snapshot = self.session_manager.session.get_context_usage_snapshot()
-            sidebar = self.query_one("#sidebar", Sidebar)
+            sidebar = self._sidebar
             sidebar.update_context_usage(snapshot)
 
-            status_bar = self.query_one(StatusBar)
+            status_bar = self._status_bar
             phase = "Generating" if self._is_generating else "Ready"
             marker = "~" if snapshot.source == "estimated" else ""
             status_bar.status = (
@@ -1420,14 +1868,14 @@ class GemCodeApp(App):
     
     async def on_input_area_submitted(self, event: InputArea.Submitted) -> None:
         """Handle user message submission"""
-        if not self.session_manager or self._is_generating:
+        if self._is_generating:
             return
         
         user_message = event.value.strip()
         if not user_message:
             return
         
-        chat_area = self.query_one("#chat-area", ChatArea)
+        chat_area = self._chat_area
         
         # Add user message
         chat_area.add_message(ChatEntry(
@@ -1435,62 +1883,61 @@ class GemCodeApp(App):
             content=user_message,
             timestamp=datetime.now()
         ))
+        # Sending a message jumps back to the latest output and re-pins the
+        # anchor, even if the user had scrolled up.
+        chat_area.scroll_end(animate=False)
+        
+        if not self._session_ready:
+            self._pending_submissions.append(user_message)
+            self._status_bar.status = "Initializing... (message queued)"
+            return
+        
+        self._start_generation(user_message)
+    
+    def _submit_next_pending(self) -> None:
+        """Start the oldest message queued during init, once the app is idle."""
+        if self._pending_submissions and self._session_ready and not self._is_generating:
+            self._start_generation(self._pending_submissions.popleft())
+    
+    def _start_generation(self, user_message: str) -> None:
+        chat_area = self._chat_area
         
         # Set loading state
         self._is_generating = True
-        self.query_one("#input-area", InputArea).set_loading(True)
-        self.query_one("#thinking-indicator", ThinkingIndicator).add_class("visible")
-        self.query_one(StatusBar).status = "Generating..."
+        self._input_area.set_loading(True)
+        self._thinking_indicator.show()
+        self._status_bar.status = "Generating..."
         
         # Start streaming message
-        streaming_widget = chat_area.start_streaming()
+        chat_area.start_streaming()
         
         # Generate response
         asyncio.create_task(self._generate_response(user_message))
     
     async def _generate_response(self, user_message: str) -> None:
         """Generate response with optimized streaming"""
-        chat_area = self.query_one("#chat-area", ChatArea)
-        
-        # 每轮的状态（每次 API 调用会重置）
-        turn_state = {
-            'content': "",
-            'reasoning': "",
-            'pending_messages': 0,
-        }
+        chat_area = self._chat_area
         
+        # The session hands `on_turn_end` the complete content and reasoning of
+        # each turn, so the app keeps no accumulator of its own: content deltas
+        # go straight to the drain buffer and reasoning is rendered at turn end.
         try:
             def on_reasoning(chunk: str) -> None:
-                """Handle reasoning content (thinking process)"""
-                turn_state['reasoning'] += chunk
-                self._update_context_display()
+                """Reasoning is rendered once per turn from `on_turn_end`."""
             
             def on_content(chunk: str) -> None:
                 """Handle formal content output with batching"""
-                turn_state['content'] += chunk
-                turn_state['pending_messages'] += 1
-                
-                # 直接更新 streaming widget
-                if chat_area._current_streaming:
-                    try:
-                        chat_area.append_streaming(chunk)
-                    except Exception as e:
-                        # Widget may have been removed
-                        print(f"Error appending streaming content: {e}")
-                self._update_context_display()
+                # Only buffer here; `_drain_chunks` flushes to the streaming
+                # widget and the 0.25s poll refreshes the context meter.
+                self._queue_chunk(chunk)
             
             def on_turn_end(content: str, reasoning: str, has_more: bool) -> None:
                 """每次 API 调用结束时调用"""
-                # 完成当前 streaming widget，转换为 ChatMessageWidget
-                if chat_area._current_streaming:
-                    try:
-                        chat_area.flush_streaming()
-                        if chat_area._current_streaming.is_mounted:
-                            chat_area._current_streaming.remove()
-                    except Exception:
-                        pass  # Widget may already be removed
-                    finally:
-                        chat_area._current_streaming = None
+                # Flush deltas still waiting for the drain timer first.
+                self._drain_chunks()
+                # 完成当前 streaming，隐藏 live pane，由 ChatMessageWidget 展示最终内容
+                chat_area.flush_streaming()
+                chat_area.end_streaming()
                 
                 # 创建最终的 assistant 消息（包含 content 和 reasoning）
                 entry = ChatEntry(
@@ -1503,17 +1950,14 @@ class GemCodeApp(App):
                 
                 # 如果有 tool 调用，显示 "Thinking..." 继续下一轮
                 if has_more:
-                    self.query_one(StatusBar).status = "Processing tools..."
-                    # 重置状态准备下一轮
-                    turn_state['content'] = ""
-                    turn_state['reasoning'] = ""
+                    self._status_bar.status = "Processing tools..."
                     # 创建新的 streaming widget 给下一轮使用
                     chat_area.start_streaming()
                 else:
                     # 全部完成
                     self._is_generating = False
-                    self.query_one("#input-area", InputArea).set_loading(False)
-                    self.query_one("#thinking-indicator", ThinkingIndicator).remove_class("visible")
+                    self._input_area.set_loading(False)
+                    self._thinking_indicator.hide()
                     # Update context display
                     self._update_context_display()
             
@@ -1562,31 +2006,40 @@ class GemCodeApp(App):
             )
             
         except Exception as e:
-            # Replace [ with \[ to prevent Rich markup parsing
-            error_msg = f"\n\n❌ Error: {str(e)}".replace("[", r"\[")
-            if chat_area._current_streaming:
-                chat_area.append_streaming(error_msg)
-                chat_area.flush_streaming()
+            err = str(e)
+            self._drain_chunks()
+            # One delta carrying just the error text. `done` finalizes it as
+            # Markdown, so the exception text is fenced to render verbatim.
+            self.post_message(
+                ResponseMessage(chunk=f"\n\n❌ Error:\n\n{_fenced_text(err)}", done=True, error=err)
+            )
             self._is_generating = False
-            self.query_one("#input-area", InputArea).set_loading(False)
-            self.query_one("#thinking-indicator", ThinkingIndicator).remove_class("visible")
-            self.query_one(StatusBar).status = "Error"
+            self._input_area.set_loading(False)
+            self._thinking_indicator.hide()
+            self._status_bar.status = "Error"
+        
+        self._submit_next_pending()
     
     def on_response_message(self, message: ResponseMessage) -> None:
-        """Handle response message - runs in main thread (for error display only)"""
+        """Handle response message - runs in main thread"""
         # Note: 正常的流式更新现在直接在 on_content 回调中处理
-        # 这个 handler 保留用于显示错误信息
-        if message.error:
-            chat_area = self.query_one("#chat-area", ChatArea)
-            if chat_area._current_streaming:
-                # Replace [ with \[ to prevent Rich markup parsing
-                error_msg = f"\n\n❌ Error: {message.error}".replace("[", r"\[")
-                chat_area.append_streaming(error_msg)
-                chat_area.flush_streaming()
+        # `chunk` is a delta, so it is appended as-is with no slicing against
+        # what the widget already shows.
+        chat_area = self._chat_area
+        if message.chunk:
+            chat_area.append_streaming(message.chunk)
+        if message.done:
+            chat_area.flush_streaming()
+            chat_area.finish_streaming()
+        if message.error is not None:
+            # A failed turn can leave tool calls that never reported back.
+            # This message is queued after their start messages, so clearing
+            # here keeps the next turn's results off those stale widgets.
+            self._pending_tool_widgets.clear()
     
     def on_tool_start_message(self, message: ToolStartMessage) -> None:
         """Handle tool call start - display tool call in chat"""
-        chat_area = self.query_one("#chat-area", ChatArea)
+        chat_area = self._chat_area
 
         # Keep the summary short because the detailed arguments are rendered in
         # a dedicated syntax-highlighted block by `ChatMessageWidget`.
@@ -1603,38 +2056,33 @@ class GemCodeApp(App):
             tool_result=None  # Will be updated when result arrives
         )
         
-        self._current_tool_widget = chat_area.add_message(entry)
+        self._pending_tool_widgets.append(chat_area.add_message(entry))
         
         # Show thinking indicator
-        self.query_one("#thinking-indicator", ThinkingIndicator).add_class("visible")
-        self.query_one(StatusBar).status = f"Running {message.tool_name}..."
+        self._thinking_indicator.show()
+        self._status_bar.status = f"Running {message.tool_name}..."
     
     def on_tool_result_message(self, message: ToolResultMessage) -> None:
         """Handle tool call result - update tool widget with result"""
-        chat_area = self.query_one("#chat-area", ChatArea)
+        chat_area = self._chat_area
         
-        # Update the existing tool widget if we have one
-        if self._current_tool_widget:
+        # Update the matching tool widget if we have one
+        if self._pending_tool_widgets:
+            tool_widget = self._pending_tool_widgets.popleft()
             try:
                 # Save entry reference before removing widget
-                entry = self._current_tool_widget.entry
+                entry = tool_widget.entry
                 # Update the entry with result
                 entry.tool_result = message.result
-                
-                # Refresh the widget to show result
-                # Remove and re-add to refresh content
-                if self._current_tool_widget.is_mounted:
-                    self._current_tool_widget.remove()
-                new_widget = ChatMessageWidget(entry)
-                chat_area.mount(new_widget)
-                chat_area.scroll_end(animate=False)
+
+                # Refresh the widget in place so concurrently started tool
+                # calls keep their relative order in the chat.
+                chat_area.replace_message(tool_widget, ChatMessageWidget(entry))
             except Exception as e:
                 # Log error but don't crash
                 print(f"Error updating tool widget: {e}")
-            finally:
-                self._current_tool_widget = None
         
-        self.query_one(StatusBar).status = "Processing..."
+        self._status_bar.status = "Processing..."
         # Update context display after tool result
         self._update_context_display()
     
@@ -1653,13 +2101,17 @@ class GemCodeApp(App):
     
     def action_clear(self) -> None:
         """Clear chat history"""
-        chat_area = self.query_one("#chat-area", ChatArea)
+        chat_area = self._chat_area
         chat_area.clear()
+        # Queued messages and tool widgets awaiting results belong to the
+        # bubbles just cleared; drop them too.
+        self._pending_submissions.clear()
+        self._pending_tool_widgets.clear()
         
-        if self.session_manager:
+        if self.session_manager and self._session_ready:
             self.session_manager.session.clear_history()
             # Reset context display
-            sidebar = self.query_one("#sidebar", Sidebar)
+            sidebar = self._sidebar
             sidebar.update_context_usage(
                 self.session_manager.session.get_context_usage_snapshot()
             )
@@ -1672,7 +2124,7 @@ class GemCodeApp(App):
             approval = self.query_one("#tool-approval", ToolApprovalInline)
             approval.cancel_pending("user_escape")
         else:
-            self.query_one("#input-area", InputArea).focus()
+            self._input_area.focus()
     
     def action_help(self) -> None:
         """Show help screen"""
@@ -1680,7 +2132,7 @@ class GemCodeApp(App):
     
     def action_toggle_sidebar(self) -> None:
         """Toggle sidebar visibility"""
-        sidebar = self.query_one("#sidebar", Sidebar)
+        sidebar = self._sidebar
         self._sidebar_visible = not self._sidebar_visible
         sidebar.display = self._sidebar_visible
     
@@ -1699,13 +2151,16 @@ class GemCodeApp(App):
 
 
 def run_tui():
-    """Entry point for TUI"""
+    """Entry point for TUI, on uvloop's event loop when it is installed."""
     try:
         config = load_config()
         app = GemCodeApp(config)
-        app.run()
-    except Exception as e:
-        print(f"Error starting TUI: {e}")
+        run_async(app.run_async())
+    except Exception as exc:
+        # Textual startup failures can otherwise collapse the alternate screen
+        # before the user sees what happened. Re-raising as plain stderr output
+        # makes startup issues diagnosable from a normal shell.
+        print(f"Gem Code TUI failed to start: {exc}", file=sys.stderr)
         raise
 
 
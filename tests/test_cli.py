@@ -1,43 +1,69 @@
+import asyncio
+import io
+
 from src import cli
 
 
-def test_cli_separates_reasoning_and_content_lines(monkeypatch) -> None:
-    events: list[tuple[str, str]] = []
+def _capture_stream(monkeypatch) -> io.StringIO:
+    buffer = io.StringIO()
+    monkeypatch.setattr(cli.console, "file", buffer)
+    cli._stream_phase = None
+    cli._stream_buffer.clear()
+    cli._stream_reset = ""
+    return buffer
 
-    def fake_print(renderable="", *, end="\n", **kwargs) -> None:
-        text = getattr(renderable, "plain", renderable)
-        events.append((text, end))
 
-    monkeypatch.setattr(cli.console, "print", fake_print)
-    cli._stream_phase = None
+def test_cli_separates_reasoning_and_content_lines(monkeypatch) -> None:
+    buffer = _capture_stream(monkeypatch)
 
     cli.on_reasoning("thinking")
     cli.on_content("answer")
 
-    assert events == [
-        ("thinking", ""),
-        ("", "\n"),
-        ("answer", ""),
-    ]
+    assert buffer.getvalue() == "thinking\nanswer"
 
 
 def test_cli_does_not_insert_extra_breaks_within_same_phase(monkeypatch) -> None:
-    events: list[tuple[str, str]] = []
-
-    def fake_print(renderable="", *, end="\n", **kwargs) -> None:
-        text = getattr(renderable, "plain", renderable)
-        events.append((text, end))
-
-    monkeypatch.setattr(cli.console, "print", fake_print)
-    cli._stream_phase = None
+    buffer = _capture_stream(monkeypatch)
 
     cli.on_reasoning("a")
     cli.on_reasoning("b")
     cli.on_content("c")
+    cli._end_stream_line()
+
+    assert buffer.getvalue() == "ab\nc\n"
+
+
+def test_cli_batches_stream_writes_until_debounce_or_newline(monkeypatch) -> None:
+    buffer = _capture_stream(monkeypatch)
+
+    async def scenario() -> None:
+        cli.on_content("a")
+        cli.on_content("b")
+        assert buffer.getvalue() == ""
+        cli.on_content("c\n")
+        assert buffer.getvalue() == "abc\n"
+        cli.on_content("d")
+        await asyncio.sleep(cli._STREAM_FLUSH_INTERVAL * 3)
+        assert buffer.getvalue() == "abc\nd"
+        cli._end_stream_line()
+
+    asyncio.run(scenario())
+
+    assert buffer.getvalue() == "abc\nd\n"
+
+
+def test_cli_writes_tool_results_verbatim(monkeypatch) -> None:
+    buffer = _capture_stream(monkeypatch)
+
+    cli.on_content("done")
+    cli.on_tool_result("bash", "x = [1, 2][/bold] ok")
+
+    assert buffer.getvalue() == "done\n👁 OBSERVE\nx = [1, 2][/bold] ok\n\n"
+
+
+def test_cli_tool_start_banner_does_not_parse_markup(monkeypatch) -> None:
+    buffer = _capture_stream(monkeypatch)
+
+    cli.on_tool_start("mcp__docs__[bold]search", {})
 
-    assert events == [
-        ("a", ""),
-        ("b", ""),
-        ("", "\n"),
-        ("c", ""),
-    ]
+    assert buffer.getvalue() == "🛠️  Executing tool: mcp__docs__[bold]search\n"
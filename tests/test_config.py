@@ -1,10 +1,15 @@
+import asyncio
 import os
+from dataclasses import replace
 
 from src.config import (
     PREDICT_BEFORE_CALL_CLAUSE,
+    acquire_openai_client,
     get_system_prompt,
     load_config,
+    release_openai_client,
     resolve_api_mode,
+    shared_rate_limiter,
 )
 
 
@@ -118,3 +123,56 @@ def test_get_system_prompt_appends_predict_clause_when_enabled(tmp_path) -> None
     # The augmentation MUST only append; no other part of the prompt may shift.
     assert augmented.startswith(legacy)
     assert PREDICT_BEFORE_CALL_CLAUSE.strip() in augmented
+
+
+def test_openai_client_is_shared_per_endpoint_until_last_release(monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("OPENAI_BASE_URL", "https://example.invalid/v1")
+    monkeypatch.setenv("WORKDIR", str(tmp_path))
+    config = load_config()
+    other = replace(config, base_url="https://other.invalid/v1")
+
+    async def run() -> None:
+        first = acquire_openai_client(config)
+        second = acquire_openai_client(config)
+        elsewhere = acquire_openai_client(other)
+        assert first is second
+        assert elsewhere is not first
+
+        await release_openai_client(first)
+        assert not second.is_closed()
+        await release_openai_client(second)
+        assert second.is_closed()
+        await release_openai_client(elsewhere)
+
+        fresh = acquire_openai_client(config)
+        assert fresh is not first
+        await release_openai_client(fresh)
+
+    asyncio.run(run())
+
+
+def test_rate_limiter_is_shared_per_credential_across_loops(monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("OPENAI_API_KEY", "limiter-key")
+    monkeypatch.setenv("OPENAI_BASE_URL", "https://example.invalid/v1")
+    monkeypatch.setenv("WORKDIR", str(tmp_path))
+    config = replace(load_config(), requests_per_minute=10, tokens_per_minute=None)
+    other = replace(config, api_key="other-key")
+
+    limiter = shared_rate_limiter(config)
+    assert limiter is not None
+    assert shared_rate_limiter(replace(config)) is limiter
+    assert shared_rate_limiter(other) is not limiter
+    assert shared_rate_limiter(replace(config, requests_per_minute=None)) is None
+
+    # Sequential event loops (one per eval task) keep drawing on one window.
+    asyncio.run(limiter.acquire())
+    asyncio.run(limiter.acquire())
+    assert len(limiter._window) == 2
+
+
+def test_get_system_prompt_is_rendered_once_per_arguments(tmp_path) -> None:
+    first = get_system_prompt(str(tmp_path))
+
+    assert get_system_prompt(str(tmp_path)) is first
+    assert get_system_prompt(str(tmp_path), predict_before_call_enabled=True) is not first
@@ -7,3 +7,19 @@ def test_should_launch_tui_requires_interactive_stdin_and_stdout() -> None:
     assert _should_launch_tui(stdin_is_tty=True, stdout_is_tty=True) is True
     assert _should_launch_tui(stdin_is_tty=False, stdout_is_tty=True) is False
     assert _should_launch_tui(stdin_is_tty=True, stdout_is_tty=False) is False
+
+
+def test_run_async_falls_back_to_default_loop_without_uvloop(monkeypatch) -> None:
+    from src import event_loop
+
+    seen: list[str] = []
+
+    async def work() -> None:
+        import asyncio
+
+        seen.append(type(asyncio.get_running_loop()).__module__)
+
+    monkeypatch.setattr(event_loop, "uvloop", None)
+    event_loop.run_async(work())
+
+    assert seen and seen[0].startswith("asyncio")
@@ -0,0 +1,66 @@
+import asyncio
+
+from src.rate_limit import RateLimiter
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_rate_limiter_waits_for_a_request_slot(monkeypatch) -> None:
+    clock = _FakeClock()
+    limiter = RateLimiter(requests_per_minute=2, clock=clock)
+    sleeps: list[float] = []
+
+    async def fake_sleep(delay: float) -> None:
+        sleeps.append(delay)
+        clock.now += delay
+
+    monkeypatch.setattr("src.rate_limit.asyncio.sleep", fake_sleep)
+
+    async def run() -> None:
+        await limiter.acquire()
+        clock.now = 10.0
+        await limiter.acquire()
+        await limiter.acquire()
+
+    asyncio.run(run())
+
+    # The third request waits until the first one leaves the 60s window.
+    assert sleeps == [50.0]
+
+
+def test_rate_limiter_settles_token_estimates_with_reported_usage(monkeypatch) -> None:
+    clock = _FakeClock()
+    limiter = RateLimiter(tokens_per_minute=1000, clock=clock)
+    sleeps: list[float] = []
+
+    async def fake_sleep(delay: float) -> None:
+        sleeps.append(delay)
+        clock.now += delay
+
+    monkeypatch.setattr("src.rate_limit.asyncio.sleep", fake_sleep)
+
+    async def run() -> None:
+        first = await limiter.acquire(900)
+        limiter.settle(first, 300)
+        # Fits only because the 900-token estimate was corrected to 300.
+        await limiter.acquire(600)
+        assert sleeps == []
+        await limiter.acquire(200)
+
+    asyncio.run(run())
+
+    assert sleeps == [60.0]
+
+
+def test_rate_limiter_admits_oversized_request_into_empty_window() -> None:
+    limiter = RateLimiter(tokens_per_minute=10)
+
+    reservation = asyncio.run(limiter.acquire(50))
+
+    assert reservation.tokens == 50
@@ -0,0 +1,223 @@
+"""Tests for Session tool scheduling, payload building and stream assembly.
+
+The permission gate has its own suite in `test_session_gate.py`; these reuse
+its network-free `_make_session` fixture helper.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+from src.models import FunctionCall, Message, ToolCall
+from src.permissions import PermissionDecision
+from test_session_gate import _make_session, _toolcall
+
+
+def test_handle_model_turn_dispatches_tool_calls_concurrently(tmp_path: Path) -> None:
+    """Independent tool calls overlap, but replies keep the request order."""
+    session = _make_session(tmp_path)
+
+    started: List[str] = []
+    both_started = asyncio.Event()
+
+    async def fake_dispatch(name: str, args: Dict[str, Any], workdir: str) -> str:
+        started.append(args["path"])
+        if len(started) == 2:
+            both_started.set()
+        # Each call blocks until the other has started, which can only
+        # complete when the calls are in flight at the same time.
+        await asyncio.wait_for(both_started.wait(), timeout=1)
+        if args["path"] == "a.txt":
+            await asyncio.sleep(0.01)
+        return f"result-for-{args['path']}"
+
+    session._dispatch_tool = fake_dispatch  # type: ignore[assignment]
+
+    asyncio.run(session._handle_model_turn(
+        content_buffer="",
+        reasoning_buffer="",
+        has_tool_calls=True,
+        tool_calls=[
+            _toolcall("call-a", "read_file", {"path": "a.txt"}),
+            _toolcall("call-b", "read_file", {"path": "b.txt"}),
+        ],
+        user_prompt="read both",
+        on_turn_end=None,
+        on_tool_start=None,
+        on_tool_result=None,
+        request_tool_approval=None,
+    ))
+
+    tool_replies = [m for m in session.history if m.role == "tool"]
+    assert [m.tool_call_id for m in tool_replies] == ["call-a", "call-b"]
+    assert [m.content for m in tool_replies] == ["result-for-a.txt", "result-for-b.txt"]
+
+
+def test_handle_model_turn_applies_same_file_edits_in_order(tmp_path: Path) -> None:
+    """Mutating calls run one at a time, so neither edit overwrites the other."""
+    session = _make_session(tmp_path)
+    target = tmp_path / "big.txt"
+    target.write_text("alpha\n" + "x" * 2_000_000 + "\nomega\n", encoding="utf-8")
+
+    async def callback(tool_name, args, ctx):
+        return PermissionDecision(
+            decision="allow_once",
+            reason="user_choice",
+            approval_key=ctx["approval_key"],
+        )
+
+    def edit(old: str, new: str) -> Dict[str, Any]:
+        return {"path": "big.txt", "edits": [{"target": old, "replacement": new}]}
+
+    asyncio.run(session._handle_model_turn(
+        content_buffer="",
+        reasoning_buffer="",
+        has_tool_calls=True,
+        tool_calls=[
+            _toolcall("call-a", "StrReplaceFile", edit("alpha", "ALPHA")),
+            _toolcall("call-b", "StrReplaceFile", edit("omega", "OMEGA")),
+        ],
+        user_prompt="edit both ends",
+        on_turn_end=None,
+        on_tool_start=None,
+        on_tool_result=None,
+        request_tool_approval=callback,
+    ))
+
+    content = target.read_text(encoding="utf-8")
+    assert content.startswith("ALPHA\n")
+    assert content.endswith("\nOMEGA\n")
+
+
+def test_chat_messages_payload_reuses_dicts_until_content_changes(tmp_path: Path) -> None:
+    session = _make_session(tmp_path)
+    session.history = [
+        Message(role="system", content="sys"),
+        Message(role="tool", content="long output", tool_call_id="call-1"),
+    ]
+
+    first = session._history_to_chat_messages()
+    second = session._history_to_chat_messages()
+    assert first[0] is second[0]
+    assert first[1] is second[1]
+
+    # Microcompaction rewrites `content` in place; the stale dict must go.
+    session.history[1].content = "moved to file"
+    third = session._history_to_chat_messages()
+    assert third[0] is first[0]
+    assert third[1] == {"role": "tool", "content": "moved to file", "tool_call_id": "call-1"}
+
+    session.history = session.history[:1]
+    session._history_to_chat_messages()
+    assert len(session._chat_dict_cache) == 1
+
+
+def test_chat_dict_is_canonical_for_tool_call_messages() -> None:
+    from src.session import _message_to_chat_dict
+
+    message = Message(
+        role="assistant",
+        content=None,
+        tool_calls=[
+            ToolCall(id="call-1", function=FunctionCall(name="bash", arguments="{}")),
+        ],
+    )
+
+    payload = _message_to_chat_dict(message)
+
+    assert list(payload) == ["role", "content", "tool_calls"]
+    assert payload["content"] == ""
+    assert list(payload["tool_calls"][0]) == ["id", "type", "function"]
+
+
+def _stream_chunk(content: Optional[str] = None, tool_calls: Optional[list] = None) -> Any:
+    delta = SimpleNamespace(content=content, tool_calls=tool_calls)
+    return SimpleNamespace(choices=[SimpleNamespace(delta=delta)], usage=None)
+
+
+def _tool_delta(call_id: Optional[str], name: Optional[str], arguments: str) -> Any:
+    return SimpleNamespace(
+        id=call_id,
+        type="function" if call_id else None,
+        function=SimpleNamespace(name=name, arguments=arguments),
+    )
+
+
+def test_chat_completions_stream_joins_tool_argument_fragments(tmp_path: Path) -> None:
+    session = _make_session(tmp_path)
+    chunks = [
+        _stream_chunk(content="Let me "),
+        _stream_chunk(content="look."),
+        _stream_chunk(tool_calls=[_tool_delta("call-a", "read_file", '{"pa')]),
+        _stream_chunk(tool_calls=[_tool_delta(None, None, 'th": "a.txt"}')]),
+        _stream_chunk(tool_calls=[_tool_delta("call-b", "glob", "")]),
+        _stream_chunk(tool_calls=[_tool_delta("call-b", None, '{"pattern": ')]),
+        _stream_chunk(tool_calls=[_tool_delta(None, None, '"*.py"}')]),
+        # Providers may close with a usage-only chunk that has no choices.
+        SimpleNamespace(choices=[], usage=SimpleNamespace(total_tokens=321)),
+    ]
+
+    # The tool-call turn is followed by a plain reply that ends the loop.
+    responses = [chunks, [_stream_chunk(content="Done.")]]
+
+    async def create(**_kwargs: Any) -> Any:
+        async def stream() -> Any:
+            for chunk in responses.pop(0):
+                yield chunk
+
+        return stream()
+
+    session.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    turns: List[Dict[str, Any]] = []
+
+    async def fake_handle_model_turn(**kwargs: Any) -> None:
+        usage = session.context_usage
+        turns.append({
+            **kwargs,
+            "server_tokens": usage.server_tokens,
+            "output_tokens": usage.estimated_output_tokens,
+        })
+
+    session._handle_model_turn = fake_handle_model_turn  # type: ignore[assignment]
+
+    asyncio.run(session._chat_with_chat_completions("look around"))
+
+    turn = turns[0]
+    assert turn["content_buffer"] == "Let me look."
+    assert [(call.id, call.function.name, call.function.arguments) for call in turn["tool_calls"]] == [
+        ("call-a", "read_file", '{"path": "a.txt"}'),
+        ("call-b", "glob", '{"pattern": "*.py"}'),
+    ]
+    assert turn["server_tokens"] == 321
+    assert turn["output_tokens"] > 0
+    assert turns[1]["tool_calls"] is None
+
+
+def test_streamed_text_heuristic_rounds_the_joined_text_once(tmp_path: Path) -> None:
+    from src.session import _StreamedText
+
+    session = _make_session(tmp_path)
+    streamed = _StreamedText()
+    for delta in ["x = 1", "\n", "print(x)", "中文", "é"] * 140:
+        streamed.append(delta)
+
+    assert streamed.token_estimate == session._estimate_text_tokens(streamed.getvalue())
+
+
+def test_skill_calls_dispatch_through_the_name_index(tmp_path: Path) -> None:
+    from src.skill import Skill
+
+    session = _make_session(tmp_path)
+    session._set_skills([
+        Skill(name="review", description="first", content="use me"),
+        Skill(name="review", description="shadowed", content="not me"),
+    ])
+
+    found = asyncio.run(session._dispatch_tool("skill__review", {}, str(tmp_path)))
+    missing = asyncio.run(session._dispatch_tool("skill__absent", {}, str(tmp_path)))
+
+    assert "use me" in found and "not me" not in found
+    assert missing == "Error: Can't find the skill absent"
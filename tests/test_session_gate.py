@@ -93,6 +93,7 @@ def _make_session(workdir: Path, *, permission_mode: str = "strict"):
     session.model = config.model
     session.api_mode = "chat_completions"
     session.skills = []
+    session._skills_by_name = {}
     session.mcp_client = None
     session._all_tools = []
     session.encoded_cwd = "test-encoded"
@@ -107,6 +108,9 @@ def _make_session(workdir: Path, *, permission_mode: str = "strict"):
     session._token_encoder = None
     session._tool_schema_token_estimate = 0
     session.policy = SessionPermissionPolicy.with_defaults(permission_mode=permission_mode)  # type: ignore[arg-type]
+    session._permission_lock = asyncio.Lock()
+    session._rate_limiter = None
+    session._chat_dict_cache = {}
     session._skills_dir_fingerprint = (0, 0)
     session.embedding_model = None
     session.tools_embeddings = None
@@ -1,8 +1,23 @@
 import asyncio
 
+import httpx
 import pytest
 
-from src.tool import run_read_file, run_write_file
+from src import tool
+from src.models import FunctionCall, ToolCall
+from src.tool import (
+    OUTPUT_TRUNCATE_LENGTH,
+    _BoundedCapture,
+    _CAPTURE_HEAD_BYTES,
+    _CAPTURE_TAIL_BYTES,
+    _plain_command_argv,
+    formatted_tool_output,
+    parse_tool_arguments,
+    run_bash,
+    run_fetch_url_to_markdown,
+    run_read_file,
+    run_write_file,
+)
 
 
 def test_read_file_rejects_path_escape(tmp_path) -> None:
@@ -37,6 +52,18 @@ def test_read_file_reads_from_start_when_only_end_line_is_set(tmp_path) -> None:
     assert result == "1: alpha\n2: beta"
 
 
+def test_read_file_reports_range_past_end_of_file(tmp_path) -> None:
+    workdir = tmp_path / "workspace"
+    workdir.mkdir()
+    target = workdir / "notes.txt"
+    target.write_text("alpha\nbeta\n", encoding="utf-8")
+
+    result = asyncio.run(run_read_file("notes.txt", str(workdir), start_line=5))
+
+    assert result.startswith("No content found in ")
+    assert result.endswith("for line range 5-EOF. File has 2 line(s).")
+
+
 def test_read_file_rejects_invalid_line_range(tmp_path) -> None:
     workdir = tmp_path / "workspace"
     workdir.mkdir()
@@ -55,3 +82,101 @@ def test_write_file_stays_inside_workspace(tmp_path) -> None:
 
     assert "Successfully wrote" in result
     assert (workdir / "nested" / "file.txt").read_text(encoding="utf-8") == "payload"
+
+
+def test_parse_tool_arguments_decodes_json_and_tolerates_garbage() -> None:
+    def call(arguments: str) -> ToolCall:
+        return ToolCall(id="call-1", function=FunctionCall(name="bash", arguments=arguments))
+
+    assert parse_tool_arguments(call('{"command": "ls", "n": 2}')) == {"command": "ls", "n": 2}
+    assert parse_tool_arguments(call('{"command": ')) == {}
+    assert parse_tool_arguments(call("")) == {}
+    assert parse_tool_arguments(call("{}")) == {}
+
+
+def test_formatted_tool_output_keeps_head_and_tail_of_long_output() -> None:
+    output = "a" * OUTPUT_TRUNCATE_LENGTH + "b" * 100 + "\n\n"
+
+    result = formatted_tool_output(output)
+
+    assert result.startswith("a" * 100)
+    assert result.endswith("b" * 100)
+    assert f"...[{len(output) - 2 - 2 * int(OUTPUT_TRUNCATE_LENGTH * 0.2)} characters omitted]..." in result
+    assert formatted_tool_output("short\n\n") == "short"
+
+
+def test_run_bash_bounds_captured_output(tmp_path) -> None:
+    result = asyncio.run(run_bash("seq 1 200000", str(tmp_path)))
+
+    assert "[output_truncated:" in result
+    assert len(result) < OUTPUT_TRUNCATE_LENGTH * 4
+    assert result.rstrip().endswith("200000")
+
+
+def test_plain_commands_skip_the_shell() -> None:
+    assert _plain_command_argv("ls -la src") == ["ls", "-la", "src"]
+    assert _plain_command_argv("ls *.py") is None
+    assert _plain_command_argv("echo $HOME") is None
+    assert _plain_command_argv("cd src") is None
+    assert _plain_command_argv("FOO=1 env") is None
+    assert _plain_command_argv("./script.sh") is None
+    assert _plain_command_argv("definitely-not-a-command-xyz") is None
+
+
+def test_run_bash_keeps_shell_semantics_for_both_paths(tmp_path) -> None:
+    (tmp_path / "a.txt").write_text("alpha\n", encoding="utf-8")
+
+    direct = asyncio.run(run_bash("ls", str(tmp_path)))
+    shell = asyncio.run(run_bash("ls | grep a && cd / && pwd", str(tmp_path)))
+    missing = asyncio.run(run_bash("definitely-not-a-command-xyz", str(tmp_path)))
+
+    assert direct.splitlines()[1:] == ["[exit_code=0]", "a.txt"]
+    assert shell.splitlines()[2:] == ["a.txt", "/"]
+    assert "[exit_code=127]" in missing
+
+
+def test_bounded_capture_cuts_the_gap_on_utf8_boundaries() -> None:
+    capture = _BoundedCapture()
+    # The head limit falls inside a two-byte "é", and the tail window starts
+    # inside a three-byte "€" once the middle is dropped; strict decoding
+    # below fails if either partial character survives.
+    capture.feed(b"a" * (_CAPTURE_HEAD_BYTES - 1) + "é".encode())
+    capture.feed(b"b" * (_CAPTURE_TAIL_BYTES * 2))
+    capture.feed("€".encode() + b"c" * (_CAPTURE_TAIL_BYTES - 2))
+
+    text = capture.getvalue().decode("utf-8")
+
+    assert capture.omitted > 0
+    assert text == "a" * (_CAPTURE_HEAD_BYTES - 1) + "c" * (_CAPTURE_TAIL_BYTES - 2)
+
+
+def test_fetch_url_honours_meta_charset_without_header_charset(monkeypatch) -> None:
+    paragraph = "中文内容测试，这是一个足够长的段落。" * 10
+    page = (
+        '<html><head><meta charset="gbk"></head>'
+        f"<body><article><p>{paragraph}</p></article></body></html>"
+    ).encode("gbk")
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=page, headers={"content-type": "text/html"})
+
+    async def fetch() -> str:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            monkeypatch.setattr(tool, "_get_fetch_client", lambda: client)
+            return await run_fetch_url_to_markdown("https://example.com/")
+
+    assert paragraph in asyncio.run(fetch())
+
+
+def test_fetch_client_is_closed_when_its_event_loop_finishes() -> None:
+    from src.event_loop import run_async
+
+    async def open_client() -> httpx.AsyncClient:
+        return tool._get_fetch_client()
+
+    first = run_async(open_client())
+    second = run_async(open_client())
+
+    assert first is not second
+    assert first.is_closed and second.is_closed
+    assert tool._fetch_clients == {}